@@ -5,52 +5,78 @@ Central configuration for the Civ6 RAG system
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
 
-# Project paths
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
-RAW_DATA_DIR = DATA_DIR / "raw"
-PROCESSED_DATA_DIR = DATA_DIR / "processed"
-VECTOR_DB_DIR = DATA_DIR / "vector_db"
+def _load_env():
+    """Load .env at import time and return a snapshot of the environment
+
+    Set PINGAL_SKIP_DOTENV=1 to skip parsing .env (and importing dotenv).
+    """
+    if os.environ.get("PINGAL_SKIP_DOTENV") != "1":
+        from dotenv import load_dotenv
+        load_dotenv()
+    return dict(os.environ)
+
+
+# Snapshot of the environment, read once instead of one os.getenv per setting
+_ENV = _load_env()
+
+
+def _int(key, default):
+    """Read an integer setting, falling back to default when unset or empty"""
+    value = _ENV.get(key)
+    return int(value) if value else default
+
+
+def _float(key, default):
+    """Read a float setting, falling back to default when unset or empty"""
+    value = _ENV.get(key)
+    return float(value) if value else default
+
+
+# Project paths (joined as strings, one Path per constant)
+_BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DATA = os.path.join(_BASE, "data")
+BASE_DIR = Path(_BASE)
+DATA_DIR = Path(_DATA)
+RAW_DATA_DIR = Path(os.path.join(_DATA, "raw"))
+PROCESSED_DATA_DIR = Path(os.path.join(_DATA, "processed"))
+VECTOR_DB_DIR = Path(os.path.join(_DATA, "vector_db"))
 
 # LLM Configuration
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4")
-LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
-MAX_TOKENS = int(os.getenv("MAX_TOKENS", "2000"))
+OPENAI_API_KEY = _ENV.get("OPENAI_API_KEY")
+ANTHROPIC_API_KEY = _ENV.get("ANTHROPIC_API_KEY")
+LLM_MODEL = _ENV.get("LLM_MODEL", "gpt-4")
+LLM_TEMPERATURE = _float("LLM_TEMPERATURE", 0.7)
+MAX_TOKENS = _int("MAX_TOKENS", 2000)
 
 # Embedding Configuration
-EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
-EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+EMBEDDING_MODEL = _ENV.get("EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_PROVIDER = _ENV.get("EMBEDDING_PROVIDER", "openai")
 
 # Scraper Configuration
-SCRAPER_DELAY = int(os.getenv("SCRAPER_DELAY", "1"))
-MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
-TIMEOUT = int(os.getenv("TIMEOUT", "30"))
+SCRAPER_DELAY = _int("SCRAPER_DELAY", 1)
+MAX_RETRIES = _int("MAX_RETRIES", 3)
+TIMEOUT = _int("TIMEOUT", 30)
 
 # URLs
 CIV6_WIKI_BASE = "https://civilization.fandom.com"
 BBG_WIKI_BASE = "https://bbg.civfanatics.com"  # Update with actual URL
 
 # RAG Configuration
-CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "800"))
-CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "100"))
-TOP_K_RESULTS = int(os.getenv("TOP_K_RESULTS", "5"))
+CHUNK_SIZE = _int("CHUNK_SIZE", 800)
+CHUNK_OVERLAP = _int("CHUNK_OVERLAP", 100)
+TOP_K_RESULTS = _int("TOP_K_RESULTS", 5)
 
 # Vector DB Configuration
-CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", str(VECTOR_DB_DIR / "chroma"))
-COLLECTION_NAME = os.getenv("COLLECTION_NAME", "civ6_knowledge")
+CHROMA_PERSIST_DIR = _ENV.get("CHROMA_PERSIST_DIR", os.path.join(_DATA, "vector_db", "chroma"))
+COLLECTION_NAME = _ENV.get("COLLECTION_NAME", "civ6_knowledge")
 
 # App Configuration
-APP_TITLE = os.getenv("APP_TITLE", "Civ6 Strategy Assistant")
-APP_ICON = os.getenv("APP_ICON", "🎮")
-MAX_HISTORY = int(os.getenv("MAX_HISTORY", "10"))
-ENABLE_STREAMING = os.getenv("ENABLE_STREAMING", "true").lower() == "true"
+APP_TITLE = _ENV.get("APP_TITLE", "Civ6 Strategy Assistant")
+APP_ICON = _ENV.get("APP_ICON", "🎮")
+MAX_HISTORY = _int("MAX_HISTORY", 10)
+ENABLE_STREAMING = _ENV.get("ENABLE_STREAMING", "true").lower() == "true"
 
 # Data Sources
 DATA_SOURCES = {
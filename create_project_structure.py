@@ -5,9 +5,16 @@ Automatically sets up the recommended folder structure for the Civ6 RAG project
 """
 
 import os
+import shutil
 from pathlib import Path
 
 
+def _write(path, text):
+    """Write text to path as UTF-8 in one binary write"""
+    with open(path, 'wb') as f:
+        f.write(text.encode('utf-8'))
+
+
 def create_directory_structure():
     """Create the complete directory structure"""
     
@@ -50,9 +57,20 @@ def create_directory_structure():
     
     # Create directories
     print("\n📁 Creating directories...")
+
+    # Collect every directory once (leaves plus their shared parents),
+    # then create them parents-first so no mkdir has to walk ancestors
+    needed = set()
     for directory in directories:
         dir_path = base_dir / directory
-        dir_path.mkdir(parents=True, exist_ok=True)
+        needed.add(dir_path)
+        needed.update(dir_path.parents)
+
+    missing = [p for p in needed if p != Path(".") and not os.path.isdir(p)]
+    for dir_path in sorted(missing, key=lambda p: len(p.parts)):
+        dir_path.mkdir(exist_ok=True)
+
+    for directory in directories:
         print(f"  ✓ {directory}")
     
     print("\n✓ All directories created!")
@@ -151,7 +169,7 @@ logs/
 """
     
     gitignore_path = Path("civ6-rag") / ".gitignore"
-    gitignore_path.write_text(gitignore_content, encoding='utf-8')
+    _write(gitignore_path, gitignore_content)
     print("  ✓ .gitignore created")
 
 
@@ -196,7 +214,7 @@ ENABLE_STREAMING=true
 """
     
     env_path = Path("civ6-rag") / ".env.example"
-    env_path.write_text(env_content, encoding='utf-8')
+    _write(env_path, env_content)
     print("  ✓ .env.example created")
     print("  ⚠️  Don't forget to copy .env.example to .env and add your API keys!")
 
@@ -289,7 +307,7 @@ DATA_SOURCES = {
 '''
     
     config_path = Path("civ6-rag") / "config" / "settings.py"
-    config_path.write_text(config_content, encoding='utf-8')
+    _write(config_path, config_content)
     print("  ✓ config/settings.py created")
 
 
@@ -360,7 +378,7 @@ Personal project for educational purposes.
 """
     
     readme_path = Path("civ6-rag") / "README.md"
-    readme_path.write_text(readme_content, encoding='utf-8')
+    _write(readme_path, readme_content)
     print("  ✓ README.md created")
 
 
@@ -391,9 +409,8 @@ def move_existing_files():
         if source_path.exists():
             dest_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Read and write (to handle cross-directory moves)
-            content = source_path.read_text(encoding='utf-8')
-            dest_path.write_text(content, encoding='utf-8')
+            # Copy the bytes directly (handles cross-directory moves)
+            shutil.copyfile(source_path, dest_path)
             print(f"  ✓ Moved {source} → {destination}")
         else:
             print(f"  ⚠️  {source} not found, skipping")
@@ -478,7 +495,7 @@ if __name__ == "__main__":
     
     for filepath, content in placeholders.items():
         file_path = base_dir / filepath
-        file_path.write_text(content, encoding='utf-8')
+        _write(file_path, content)
         print(f"  ✓ {filepath}")
 
 
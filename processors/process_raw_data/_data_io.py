@@ -0,0 +1,60 @@
+"""
+Input/output helpers shared by every raw data normalizer.
+
+The official wiki, BBG wiki and YouTube scripts all load a raw JSON dump
+and write {"text": ...} records; the data directory, the loader and the
+writer live here so the output format is defined in one place.
+
+The normalizers are packages, so run them as modules from the repo root,
+e.g. python -m processors.process_raw_data.official_wiki.normalize_wonders
+"""
+
+import mmap
+from pathlib import Path
+
+import orjson
+
+# Repo-level data directory, so the scripts work from any checkout
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+def load_json(path):
+    """
+    Load a JSON file with orjson, reading it through a read-only mmap.
+
+    The kernel pages the file in as orjson parses it, so the raw dump is
+    never copied into a separate bytes object next to the parsed data.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # The view has to be released before the mapping can close
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def write_chunks(chunks, path):
+    """
+    Write chunks to path as a JSON array of {"text": ...} records.
+
+    Records are streamed one at a time; the bytes match
+    json.dump(indent=2, ensure_ascii=False) of the same list. A path ending
+    in ".jsonl" gets one compact record per line instead, for loaders that
+    read records one by one. Returns the number of records.
+    """
+    if str(path).endswith(".jsonl"):
+        count = 0
+        with open(path, "wb") as f:
+            for c in chunks:
+                f.write(orjson.dumps({"text": c}))
+                f.write(b"\n")
+                count += 1
+        return count
+
+    count = 0
+    with open(path, "wb") as f:
+        for c in chunks:
+            f.write(b',\n  {\n    "text": ' if count else b'[\n  {\n    "text": ')
+            f.write(orjson.dumps(c))
+            f.write(b"\n  }")
+            count += 1
+        f.write(b"\n]" if count else b"[]")
+    return count
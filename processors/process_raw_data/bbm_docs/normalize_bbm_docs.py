@@ -1,5 +1,30 @@
-import json
 import re
+from bisect import bisect_right
+from itertools import accumulate
+
+from .._data_io import DATA_DIR, write_chunks
+
+# The "X.Y" after a "Step " prefix; matched from offset 5
+_STEP_SUB_RE = re.compile(r'\d+\.\d+')
+
+
+def _heading_level(line_stripped):
+    """Return the heading level of a stripped, non-empty line, or None if it isn't a heading."""
+    if line_stripped[-1] in '.,':
+        return None
+    # "Step X.Y" subsections are level 2, any other "Step " line is major
+    if line_stripped.startswith('Step '):
+        return 2 if _STEP_SUB_RE.match(line_stripped, 5) else 1
+    # Major heading (all caps)
+    if line_stripped.isupper():
+        return 1
+    # Short lines that might be subheadings, but be conservative
+    if (len(line_stripped) < 80
+            and ',' not in line_stripped and '(' not in line_stripped and ')' not in line_stripped):
+        if len(line_stripped.split()) <= 8 and line_stripped[0].isupper():
+            return 2
+    return None
+
 
 def parse_hierarchical_sections(text):
     """
@@ -13,80 +38,44 @@ def parse_hierarchical_sections(text):
     """
     sections = []
     
-    # Split by lines to process heading hierarchy
-    lines = text.split('\n')
-    
     current_section = None
+    current_level = None
     current_content = []
-    parent_stack = []  # Track hierarchy
-    
-    for line in lines:
+    parent = None  # Most recent level-1 heading
+    
+    def save_section():
+        if current_section and current_content:
+            sections.append({
+                'title': current_section,
+                'level': current_level,
+                'content': '\n'.join(current_content),
+                'parent': parent if current_level == 2 else None
+            })
+    
+    # split('\n') rather than splitlines(): only '\n' starts a new line, so a
+    # stray '\r' or '\f' stays inside its line and is removed by strip()
+    for line in text.split('\n'):
         line_stripped = line.strip()
+        if not line_stripped:
+            # Empty lines are neither headings nor content
+            continue
         
-        # Detect headings (lines that look like titles)
-        # Heuristic: Short lines, possibly ending with specific patterns
-        is_heading = False
-        heading_level = 1
-        
-        # Check for common heading patterns
-        if line_stripped and not line_stripped.endswith('.') and not line_stripped.endswith(','):
-            # Check if it's a major heading (all caps, or starts with "Step")
-            if line_stripped.isupper() or line_stripped.startswith('Step '):
-                is_heading = True
-                heading_level = 1
-            # Check for subsection patterns (starts with "Step X.Y")
-            elif re.match(r'^Step \d+\.\d+', line_stripped):
-                is_heading = True
-                heading_level = 2
-            # Short lines that might be subheadings
-            elif len(line_stripped) < 80 and line_stripped and not any(c in line_stripped for c in [',', '(', ')']):
-                # Could be a heading, but be conservative
-                words = line_stripped.split()
-                if len(words) <= 8 and line_stripped[0].isupper():
-                    is_heading = True
-                    heading_level = 2
+        level = _heading_level(line_stripped)
+        if level is None:
+            current_content.append(line_stripped)
+            continue
         
-        if is_heading and current_section:
-            # Save previous section
-            if current_content:
-                sections.append({
-                    'title': current_section,
-                    'level': heading_level,
-                    'content': '\n'.join(current_content).strip(),
-                    'parent': parent_stack[-1] if parent_stack else None
-                })
-            
-            # Start new section
-            current_section = line_stripped
+        if current_section:
+            save_section()
             current_content = []
-            
-            # Update parent stack based on level
-            if heading_level == 1:
-                parent_stack = [line_stripped]
-            elif heading_level == 2:
-                if len(parent_stack) > 0:
-                    parent_stack = [parent_stack[0], line_stripped]
-                else:
-                    parent_stack = [line_stripped]
-        
-        elif is_heading and not current_section:
-            # First heading
-            current_section = line_stripped
-            parent_stack = [line_stripped]
+        # else: first heading; content before it belongs to this section
         
-        else:
-            # Content line
-            if line_stripped:  # Skip empty lines
-                current_content.append(line_stripped)
+        current_section = line_stripped
+        current_level = level
+        if level == 1:
+            parent = line_stripped
     
-    # Save last section
-    if current_section and current_content:
-        sections.append({
-            'title': current_section,
-            'level': heading_level,
-            'content': '\n'.join(current_content).strip(),
-            'parent': parent_stack[-1] if parent_stack and len(parent_stack) > 1 else None
-        })
+    save_section()
     
     return sections
 
@@ -96,23 +85,20 @@ def split_long_section(content, max_words=400):
     Split a long section into multiple parts while preserving paragraph boundaries.
     """
     paragraphs = content.split('\n')
-    chunks = []
-    current_chunk = []
-    current_word_count = 0
     
-    for para in paragraphs:
-        para_words = len(para.split())
-        
-        if current_word_count + para_words > max_words and current_chunk:
-            chunks.append('\n'.join(current_chunk))
-            current_chunk = []
-            current_word_count = 0
-        
-        current_chunk.append(para)
-        current_word_count += para_words
+    # Running word total at the end of each paragraph
+    cumulative = list(accumulate(len(para.split()) for para in paragraphs))
+    
+    chunks = []
+    start = 0
+    offset = 0
     
-    if current_chunk:
-        chunks.append('\n'.join(current_chunk))
+    while start < len(paragraphs):
+        # Last paragraph that still fits, but always take at least one
+        end = max(bisect_right(cumulative, offset + max_words), start + 1)
+        chunks.append('\n'.join(paragraphs[start:end]))
+        offset = cumulative[end - 1]
+        start = end
     
     return chunks
 
@@ -147,10 +133,10 @@ def normalize_bbm_documentation(data_list):
             continue
         
         # Combine all content
-        full_text = ""
+        content_parts = []
         for sec in sections:
-            content_list = sec.get("content", [])
-            full_text += '\n'.join(content_list)
+            content_parts.extend(sec.get("content", []))
+        full_text = '\n'.join(content_parts)
         
         if not full_text.strip():
             continue
@@ -186,10 +172,10 @@ def normalize_bbm_documentation(data_list):
             if not sec_content:
                 continue
             
-            # Check if section is too long
-            word_count = len(sec_content.split())
-            
-            if word_count > 400:
+            # Check if section is too long. Every word takes at least one
+            # character plus a separator, so anything up to 800 characters
+            # can't exceed 400 words and skips building the word list.
+            if len(sec_content) > 800 and len(sec_content.split()) > 400:
                 # Split long sections
                 content_chunks = split_long_section(sec_content, max_words=400)
                 
@@ -229,9 +215,8 @@ def normalize_bbm_documentation(data_list):
 
 
 def main():
-    # Load the BBM documentation from plain text file
-    with open(r"C:\Users\jeanb\Documents\misc-code\PingalAI\data\raw\bbm\BBM v1.1.txt", encoding="utf-8") as f:
-        text_content = f.read()
+    # Load the BBM documentation from plain text file (decoded in one call)
+    text_content = (DATA_DIR / "raw" / "bbm" / "BBM v1.1.txt").read_bytes().decode("utf-8")
     
     # Create a data structure similar to what normalize_bbm_documentation expects
     doc_data = [{
@@ -247,14 +232,12 @@ def main():
     # Normalize the documentation
     chunks = normalize_bbm_documentation(doc_data)
     
-    # Save as list of dictionaries with "text" key
-    saved = [{"text": c} for c in chunks]
-    
-    with open(r"data\processed\bbm\documentation.json", "w", encoding="utf-8") as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+    # Stream as a list of dictionaries with "text" key
+    out_path = DATA_DIR / "processed" / "bbm" / "documentation.json"
+    write_chunks(chunks, out_path)
     
     print(f"Processed {len(chunks)} documentation chunks")
-    print(f"Saved to: data\\processed\\bbm\\documentation.json")
+    print(f"Saved to: {out_path}")
     
     # Print some statistics
     if chunks:
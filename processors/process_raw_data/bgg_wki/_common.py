@@ -0,0 +1,59 @@
+# Bump whenever normalize_sections changes its output, so run_all does not
+# keep serving results cached by an older version
+NORMALIZER_VERSION = b"2"
+
+
+def normalize_sections(data):
+    """
+    Normalize one BBG wiki page for RAG use.
+    
+    Shared by the per-category BBG normalizers, which all produce the same
+    chunk layout.
+    
+    Extracts:
+    - Title: Main document title
+    - Section: Section heading
+    - Key Facts: Short content items (< 200 chars)
+    - Main Content: Longer descriptive text (>= 200 chars)
+    - Source: Metadata string
+    """
+    out = []
+    title = data.get("title", "")
+    source = data.get("source", "")
+    category = data.get("category", "")
+    page_name = data.get("page_name", "")
+    version = data.get("bbg_version", "")
+
+    # Title and source metadata are the same for every section of the document
+    title_line = f"Title: {title}" if title else ""
+    meta = ", ".join(filter(None, (source, category, page_name, f"v{version}" if version else "")))
+    source_line = f"Source: {meta}" if meta else ""
+
+    for sec in data.get("sections", ()):
+        heading = sec.get("heading", "")
+        content_list = sec.get("content") or ()
+
+        # A heading with no content would only produce a Title/Section stub
+        if not content_list:
+            continue
+
+        # Separate short facts from longer content
+        facts = [c.strip() for c in content_list if len(c) < 200]
+        main = [c.strip() for c in content_list if len(c) >= 200]
+
+        # Build the chunk
+        chunk = []
+        if title_line:
+            chunk.append(title_line)
+        if heading:
+            chunk.append(f"Section: {heading}")
+        if facts:
+            chunk.append("Key Facts:\n" + "\n".join(["- " + f for f in facts]))
+        if main:
+            chunk.append("Main Content:\n" + "\n".join(main))
+        if source_line:
+            chunk.append(source_line)
+
+        out.append("\n".join(chunk))
+
+    return out
@@ -1,90 +1,35 @@
-import json
+"""
+Normalize units data from BBG wiki for RAG use.
 
-def normalize_units(data):
-    """
-    Normalize units data from BBG wiki for RAG use.
-    
-    Extracts:
-    - Title: Main document title
-    - Section: Unit name (e.g., "Warrior", "Tank", "Battleship")
-    - Key Facts: Short content items (< 200 chars) - includes costs, stats, movement, strength
-    - Main Content: Longer descriptive text (>= 200 chars)
-    - Source: Metadata string
-    """
-    out = []
-    title = data.get("title", "")
-    source = data.get("source", "")
-    category = data.get("category", "")
-    page_name = data.get("page_name", "")
-    version = data.get("bbg_version", "")
-
-    for sec in data.get("sections", []):
-        heading = sec.get("heading", "")
-        content_list = sec.get("content", [])
-        facts = []
-        main = []
-
-        # Separate short facts from longer content
-        for c in content_list:
-            if len(c) < 200:
-                facts.append(c.strip())
-            else:
-                main.append(c.strip())
-
-        # Build the chunk
-        chunk = []
-        
-        if title:
-            chunk.append(f"Title: {title}")
-        
-        if heading:
-            chunk.append(f"Section: {heading}")
-        
-        if facts:
-            chunk.append("Key Facts:")
-            for f in facts:
-                chunk.append(f"- {f}")
-        
-        if main:
-            chunk.append("Main Content:")
-            for m in main:
-                chunk.append(m)
-        
-        # Build source metadata
-        meta_parts = []
-        if source:
-            meta_parts.append(source)
-        if category:
-            meta_parts.append(category)
-        if page_name:
-            meta_parts.append(page_name)
-        if version:
-            meta_parts.append(f"v{version}")
-        
-        if meta_parts:
-            chunk.append("Source: " + ", ".join(meta_parts))
+Extracts:
+- Title: Main document title
+- Section: Unit name (e.g., "Warrior", "Tank", "Battleship")
+- Key Facts: Short content items (< 200 chars) - includes costs, stats, movement, strength
+- Main Content: Longer descriptive text (>= 200 chars)
+- Source: Metadata string
+"""
 
-        out.append("\n".join(chunk))
-
-    return out
+from .._data_io import DATA_DIR, load_json, write_chunks
+from ._common import normalize_sections as normalize_units
 
 
 def main():
     # Load the units data
-    with open(r"data\raw\bbg_wiki\bbg_complete_data.json", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(DATA_DIR / "raw" / "bbg_wiki" / "bbg_complete_data.json")
+    
+    # Keep only the subtree this script uses so the rest of the dump can be freed
+    sub = data.get('unit', {})[0]
+    del data
 
     # Normalize the units data
-    chunks = normalize_units(data.get('unit', {})[0])
-    
-    # Save as list of dictionaries with "text" key
-    saved = [{"text": c} for c in chunks]
+    chunks = normalize_units(sub)
     
-    with open(r"data\processed\bbg\units.json", "w", encoding="utf-8") as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+    # Stream as a list of dictionaries with "text" key
+    out_path = DATA_DIR / "processed" / "bbg" / "units.json"
+    write_chunks(chunks, out_path)
     
     print(f"Processed {len(chunks)} unit chunks")
-    print(f"Saved to: data\\processed\\bbg\\units.json")
+    print(f"Saved to: {out_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+"""
+Normalize every BBG wiki category in one run.
+
+Loads bbg_complete_data.json once and sends each category through the
+shared section normalizer, instead of every per-category script parsing
+the same file again. Each category's output is cached under a hash of its
+input, so a rerun only normalizes the categories that changed; only the
+latest entry per category is kept. Leaders are scraped into a separate
+file (bbg_complete_data_v2.json) and still go through normalize_leaders.py.
+"""
+
+import os
+import shutil
+from hashlib import blake2b
+
+import orjson
+
+from .._data_io import DATA_DIR, load_json, write_chunks
+from ._common import NORMALIZER_VERSION, normalize_sections
+
+# (key in bbg_complete_data.json, output file in data/processed/bbg, label for the summary)
+CATEGORIES = [
+    ("building", "buildings.json", "building"),
+    ("city_state", "city_states.json", "city state"),
+    ("world_congress", "congress.json", "world congress resolution"),
+    ("governor", "governor.json", "governor ability"),
+    ("great_person", "great_people.json", "great person"),
+    ("miscellaneous", "misc.json", "miscellaneous"),
+    ("natural_wonder", "natural_wonder.json", "natural wonder"),
+    ("policy", "policies.json", "policy"),
+    ("religion", "religion.json", "religion belief"),
+    ("unit", "units.json", "unit"),
+    ("wonder", "world_wonder.json", "world wonder"),
+]
+
+
+def main():
+    # Load the BBG data once for all categories
+    data = load_json(DATA_DIR / "raw" / "bbg_wiki" / "bbg_complete_data.json")
+
+    out_dir = DATA_DIR / "processed" / "bbg"
+    # Normalized outputs keyed by a hash of their input, reused on later runs
+    cache_dir = DATA_DIR / "processed" / ".cache" / "bbg"
+    os.makedirs(cache_dir, exist_ok=True)
+
+    for key, filename, label in CATEGORIES:
+        out_path = out_dir / filename
+
+        # A missing or empty category must not stop the ones after it
+        entries = data.get(key)
+        if not entries:
+            print(f"No {label} data in the BBG dump, skipped")
+            continue
+        sub = entries[0]
+
+        # Categories whose input did not change since the last run are copied from the cache
+        digest = blake2b(orjson.dumps(sub) + NORMALIZER_VERSION, digest_size=16).hexdigest()
+        cache_path = cache_dir / f"{key}-{digest}.json"
+        if os.path.exists(cache_path):
+            shutil.copyfile(cache_path, out_path)
+            print(f"Unchanged {label} data, reused cache -> {out_path}")
+            continue
+
+        chunks = normalize_sections(sub)
+
+        # Stream as a list of dictionaries with "text" key
+        write_chunks(chunks, out_path)
+
+        # Only the latest output per category is kept in the cache
+        for stale_path in cache_dir.glob(f"{key}-*.json"):
+            os.remove(stale_path)
+        shutil.copyfile(out_path, cache_path)
+
+        print(f"Processed {len(chunks)} {label} chunks -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
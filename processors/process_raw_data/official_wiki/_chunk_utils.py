@@ -0,0 +1,75 @@
+"""
+Helpers shared by the official Civ6 wiki normalizers.
+
+Each normalizer keeps its own section routing; the pieces they have in
+common (splitting long content, name extraction, fact/main partition and
+chunk blocks) live here. Loading and writing the data files is in
+processors.process_raw_data._data_io, and the per-page worker pool in
+processors.process_raw_data._pool.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+# Wiki page titles look like "American (Civ6)"
+_CIV6_SUFFIX = "(Civ6)"
+
+
+def split_long_content(content_list, max_words=300, word_counts=None):
+    """
+    Split long content blocks into smaller semantic chunks.
+    Tries to keep paragraphs together when possible.
+
+    word_counts can be passed when the caller already counted the words of
+    each item, so the items are not split a second time.
+    """
+    if word_counts is None:
+        word_counts = [len(item.split()) for item in content_list]
+
+    # Running word total at the end of each item
+    cumulative = list(accumulate(word_counts))
+
+    chunks = []
+    start = 0
+    offset = 0
+
+    while start < len(content_list):
+        # Last item that still fits, but always take at least one
+        end = max(bisect_right(cumulative, offset + max_words), start + 1)
+        chunks.append(' '.join(content_list[start:end]))
+        offset = cumulative[end - 1]
+        start = end
+
+    return chunks
+
+
+def extract_name(title):
+    """Extract the page name from a title like 'American (Civ6)'"""
+    # Plain substring search; the name needs at least one character
+    i = title.find(_CIV6_SUFFIX, 1)
+    return title[:i].rstrip() if i >= 0 else title
+
+
+def partition(content_list, threshold=200, strip=True):
+    """
+    Split content into short facts and longer main content, both stripped.
+
+    Pass strip=False when the items were already stripped, so they are
+    not stripped a second time.
+    """
+    # One pass, so each item's length is only taken once
+    facts = []
+    main_content = []
+
+    for item in content_list:
+        if len(item) < threshold:
+            facts.append(item.strip() if strip else item)
+        else:
+            main_content.append(item.strip() if strip else item)
+
+    return facts, main_content
+
+
+def block(header, lines):
+    """A header line followed by one line per item, as a newline-prefixed block"""
+    return f"\n{header}" + "".join(["\n" + line for line in lines])
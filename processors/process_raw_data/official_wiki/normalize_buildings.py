@@ -1,262 +1,231 @@
-import json
-import re
+import io
 
-def split_long_content(content_list, max_words=300):
-    """
-    Split long content blocks into smaller semantic chunks.
-    Tries to keep paragraphs together when possible.
-    """
-    chunks = []
-    current_chunk = []
-    current_word_count = 0
-    
-    for item in content_list:
-        word_count = len(item.split())
-        
-        # If adding this item would exceed max_words, save current chunk and start new
-        if current_word_count + word_count > max_words and current_chunk:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
-            current_word_count = 0
-        
-        current_chunk.append(item)
-        current_word_count += word_count
-    
-    # Add remaining content
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
-    
-    return chunks
+from .._data_io import DATA_DIR, load_json, write_chunks
+from .._pool import map_pages
+from ._chunk_utils import (
+    extract_name as extract_building_name,
+    partition,
+    split_long_content,
+)
 
+# District headers inside the "Buildings with regional effects" section
+_DISTRICT_HEADERS = frozenset([
+    "Industrial Zone[]",
+    "Entertainment Complex[]",
+    "Water Park[]",
+    "Holy Site[]",
+])
 
-def extract_building_name(title):
-    """Extract building name from title like 'Building (Civ6)'"""
-    match = re.match(r'(.+?)\s*\(Civ6\)', title)
-    return match.group(1) if match else title
+# Shared read-only default for pages without metadata
+_EMPTY_DICT = {}
 
 
-def normalize_buildings(data_list):
-    """
-    Normalize building data from Civ6 wiki for RAG use.
+def _emit(buf, header, items, prefix="- "):
+    """Write a block header followed by one prefixed line per item"""
+    buf.write(header + "\n" + "".join([prefix + item + "\n" for item in items]))
+
+
+def _flush(buf):
+    """Return the chunk written to buf and reset it for the next one"""
+    chunk = buf.getvalue().rstrip("\n")
+    buf.seek(0)
+    buf.truncate(0)
+    return chunk
+
+
+def _normalize_one(data):
+    """Normalize a single building page into its list of chunks"""
+    out = []
     
-    Creates multiple chunk types:
-    1. General system chunks - how buildings work (Introduction, Requirements, Effects)
-    2. Specific building chunks - individual building details
-    3. Regional effect chunks - buildings that affect multiple cities
+    # Every chunk of the page is written into one reusable buffer
+    buf = io.StringIO()
     
-    Extracts:
-    - Title: Building name or "Building System"
-    - Section: Specific topic
-    - Key Facts: Short items and bullet points
-    - Main Content: Detailed explanations
-    - Source: Metadata string
-    """
-    out = []
+    title = data.get("title", "")
+    source = data.get("source", "")
+    category = data.get("category", "")
+    url = data.get("url", "")
+    metadata = data.get("metadata") or _EMPTY_DICT
+    
+    # Extract building name
+    building_name = extract_building_name(title)
+    
+    # Per-document lines, shared by every section below
+    if building_name == "Building":
+        title_line = "Title: Building System\n"
+    else:
+        title_line = f"Title: {building_name}\n"
+    # Empty metadata fields are left out, as in the BBG normalizers
+    meta = (source, category)
+    source_line = "Source: " + ", ".join(filter(None, meta)) + "\n"
+    mechanics_source_line = "Source: " + ", ".join(filter(None, meta + ("game_mechanics",))) + "\n"
+    regional_source_line = "Source: " + ", ".join(filter(None, meta + ("regional_effects",))) + "\n"
     
-    for data in data_list:
-        title = data.get("title", "")
-        source = data.get("source", "")
-        category = data.get("category", "")
-        url = data.get("url", "")
-        metadata = data.get("metadata", {})
+    for sec in data.get("sections") or ():
+        heading = sec.get("heading", "")
+        content_list = sec.get("content") or ()
         
-        # Extract building name
-        building_name = extract_building_name(title)
+        if not content_list:
+            continue
         
-        for sec in data.get("sections", []):
-            heading = sec.get("heading", "")
-            content_list = sec.get("content", [])
+        # Determine chunk type and handling based on heading
+        
+        # === GENERAL BUILDING SYSTEM INFORMATION ===
+        if building_name == "Building" and heading in ["Introduction", "Requirements[]", "Effects[]"]:
+            # These explain the building system in general
+            facts, main_content = partition(content_list)
             
-            if not content_list:
-                continue
+            buf.write("Title: Building System\n")
+            buf.write(f"Section: {heading.replace('[]', '').strip()}\n")
             
-            # Determine chunk type and handling based on heading
+            if facts:
+                _emit(buf, "Key Facts:", facts)
             
-            # === GENERAL BUILDING SYSTEM INFORMATION ===
-            if building_name == "Building" and heading in ["Introduction", "Requirements[]", "Effects[]"]:
-                # These explain the building system in general
-                facts = []
-                main_content = []
-                
-                for item in content_list:
-                    if len(item) < 200:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                chunk.append("Title: Building System")
-                chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                
-                if facts:
-                    chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}, game_mechanics")
-                out.append("\n".join(chunk))
+            if main_content:
+                _emit(buf, "Main Content:", main_content, prefix="")
             
-            # === REGIONAL EFFECTS (Special category) ===
-            elif "regional" in heading.lower() or heading == "Buildings with regional effects[]":
-                # Split this into overview + specific district sections
-                
-                # First chunk: Overview of regional effects
-                overview_content = []
-                district_sections = {}
-                current_district = None
-                
-                for item in content_list:
-                    # Check if this item is a district header (e.g., "Industrial Zone[]")
-                    if item.strip().endswith("[]") and any(district in item for district in 
-                        ["Industrial Zone", "Entertainment Complex", "Water Park", "Holy Site"]):
-                        current_district = item.strip().replace("[]", "").strip()
-                        district_sections[current_district] = []
-                    elif current_district:
-                        district_sections[current_district].append(item)
-                    else:
-                        overview_content.append(item)
+            buf.write(mechanics_source_line)
+            out.append(_flush(buf))
+        
+        # === REGIONAL EFFECTS (Special category) ===
+        elif "regional" in heading.lower() or heading == "Buildings with regional effects[]":
+            # Split this into overview + specific district sections
+            
+            # First chunk: Overview of regional effects
+            overview_content = []
+            district_sections = {}
+            current_district = None
+            
+            for item in content_list:
+                # Check if this item is a district header (e.g., "Industrial Zone[]")
+                stripped = item.strip()
+                if stripped in _DISTRICT_HEADERS:
+                    current_district = stripped[:-2]
+                    district_sections[current_district] = []
+                elif current_district:
+                    district_sections[current_district].append(item)
+                else:
+                    overview_content.append(item)
+            
+            # Create overview chunk
+            if overview_content:
+                word_counts = [len(item.split()) for item in overview_content]
+                total_words = sum(word_counts)
                 
-                # Create overview chunk
-                if overview_content:
-                    total_words = sum(len(item.split()) for item in overview_content)
+                if total_words > 300:
+                    content_chunks = split_long_content(overview_content, max_words=300, word_counts=word_counts)
                     
-                    if total_words > 300:
-                        content_chunks = split_long_content(overview_content, max_words=300)
+                    for i, chunk_content in enumerate(content_chunks):
+                        buf.write("Title: Building System\n")
                         
-                        for i, chunk_content in enumerate(content_chunks):
-                            chunk = []
-                            chunk.append("Title: Building System")
-                            
-                            if len(content_chunks) > 1:
-                                chunk.append(f"Section: Regional Effects Overview (Part {i+1}/{len(content_chunks)})")
-                            else:
-                                chunk.append("Section: Regional Effects Overview")
-                            
-                            chunk.append("Main Content:")
-                            chunk.append(chunk_content)
-                            chunk.append(f"Source: {source}, {category}, regional_effects")
-                            out.append("\n".join(chunk))
-                    else:
-                        chunk = []
-                        chunk.append("Title: Building System")
-                        chunk.append("Section: Regional Effects Overview")
-                        chunk.append("Main Content:")
-                        for item in overview_content:
-                            chunk.append(item.strip())
-                        chunk.append(f"Source: {source}, {category}, regional_effects")
-                        out.append("\n".join(chunk))
-                
-                # Create separate chunks for each district's regional buildings
-                for district, district_content in district_sections.items():
-                    if district_content:
-                        chunk = []
-                        chunk.append("Title: Building System")
-                        chunk.append(f"Section: Regional Effects - {district}")
-                        chunk.append("Key Facts:")
-                        for item in district_content:
-                            if item.strip():
-                                chunk.append(f"- {item.strip()}")
-                        chunk.append(f"Source: {source}, {category}, regional_effects")
-                        out.append("\n".join(chunk))
+                        if len(content_chunks) > 1:
+                            buf.write(f"Section: Regional Effects Overview (Part {i+1}/{len(content_chunks)})\n")
+                        else:
+                            buf.write("Section: Regional Effects Overview\n")
+                        
+                        _emit(buf, "Main Content:", [chunk_content], prefix="")
+                        buf.write(regional_source_line)
+                        out.append(_flush(buf))
+                else:
+                    buf.write("Title: Building System\n")
+                    buf.write("Section: Regional Effects Overview\n")
+                    _emit(buf, "Main Content:", [item.strip() for item in overview_content], prefix="")
+                    buf.write(regional_source_line)
+                    out.append(_flush(buf))
             
-            # === SPECIFIC BUILDING INFORMATION ===
-            elif building_name != "Building":
-                # This is a specific building page (like "Library (Civ6)")
-                facts = []
-                main_content = []
-                
-                for item in content_list:
-                    if len(item) < 200:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                chunk.append(f"Title: {building_name}")
-                chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                
-                # Add metadata if available
-                if heading == "Introduction" and metadata:
-                    if not facts:
-                        chunk.append("Key Facts:")
-                    else:
-                        chunk.append("Key Facts:")
+            # Create separate chunks for each district's regional buildings
+            for district, district_content in district_sections.items():
+                if district_content:
+                    buf.write("Title: Building System\n")
+                    buf.write(f"Section: Regional Effects - {district}\n")
+                    _emit(buf, "Key Facts:", [item.strip() for item in district_content if item.strip()])
+                    buf.write(regional_source_line)
+                    out.append(_flush(buf))
+        
+        # === SPECIFIC BUILDING INFORMATION ===
+        elif building_name != "Building":
+            # This is a specific building page (like "Library (Civ6)")
+            facts, main_content = partition(content_list)
+            
+            buf.write(title_line)
+            buf.write(f"Section: {heading.replace('[]', '').strip()}\n")
+            
+            # Metadata (Introduction only) and facts share one Key Facts block
+            show_metadata = heading == "Introduction" and metadata
+            if facts or show_metadata:
+                buf.write("Key Facts:\n")
+                if show_metadata:
                     for key, value in metadata.items():
                         if value:
-                            chunk.append(f"- {key}: {value}")
-                
-                if facts:
-                    if heading != "Introduction" or not metadata:
-                        chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}")
-                out.append("\n".join(chunk))
+                            buf.write(f"- {key}: {value}\n")
+                buf.write("".join(["- " + f + "\n" for f in facts]))
             
-            # === OTHER SECTIONS ===
-            else:
-                # Generic handling for any other sections
-                facts = []
-                main_content = []
-                
-                for item in content_list:
-                    if len(item) < 200:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                
-                if building_name == "Building":
-                    chunk.append("Title: Building System")
-                else:
-                    chunk.append(f"Title: {building_name}")
-                
-                chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                
-                if facts:
-                    chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}")
-                out.append("\n".join(chunk))
+            if main_content:
+                _emit(buf, "Main Content:", main_content, prefix="")
+            
+            buf.write(source_line)
+            out.append(_flush(buf))
+        
+        # === OTHER SECTIONS ===
+        else:
+            # Generic handling for any other sections
+            facts, main_content = partition(content_list)
+            
+            buf.write(title_line)
+            
+            buf.write(f"Section: {heading.replace('[]', '').strip()}\n")
+            
+            if facts:
+                _emit(buf, "Key Facts:", facts)
+            
+            if main_content:
+                _emit(buf, "Main Content:", main_content, prefix="")
+            
+            buf.write(source_line)
+            out.append(_flush(buf))
     
     return out
 
 
+def normalize_buildings(data_list, max_workers=1):
+    """
+    Normalize building data from Civ6 wiki for RAG use.
+    
+    Creates multiple chunk types:
+    1. General system chunks - how buildings work (Introduction, Requirements, Effects)
+    2. Specific building chunks - individual building details
+    3. Regional effect chunks - buildings that affect multiple cities
+    
+    Extracts:
+    - Title: Building name or "Building System"
+    - Section: Specific topic
+    - Key Facts: Short items and bullet points
+    - Main Content: Detailed explanations
+    - Source: Metadata string
+    
+    Pages run in the current process unless max_workers asks for worker
+    processes (None = one per CPU); see map_pages.
+    Repeated chunks are kept only once.
+    """
+    return map_pages(_normalize_one, data_list, max_workers)
+
+
 def main():
     # Load the buildings data
-    with open(r"C:\Users\jeanb\Documents\misc-code\PingalAI\data\raw\civ6_wiki\civ6_complete_data.json", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(DATA_DIR / "raw" / "civ6_wiki" / "civ6_complete_data.json")
     
-    # Normalize the buildings data
-    chunks = normalize_buildings(data.get('buildings', {}))
+    # Keep only the subtree this script uses so the rest of the dump can be freed
+    sub = data.get('buildings', {})
+    del data
     
-    # Save as list of dictionaries with "text" key
-    saved = [{"text": c} for c in chunks]
+    # Normalize the buildings data
+    chunks = normalize_buildings(sub)
     
-    with open(r"data\processed\official_wiki\buildings.json", "w", encoding="utf-8") as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+    # Stream as a list of dictionaries with "text" key
+    out_path = DATA_DIR / "processed" / "official_wiki" / "buildings.json"
+    write_chunks(chunks, out_path)
     
     print(f"Processed {len(chunks)} building chunks")
-    print(f"Saved to: data\\processed\\official_wiki\\buildings.json")
+    print(f"Saved to: {out_path}")
 
 
 if __name__ == "__main__":
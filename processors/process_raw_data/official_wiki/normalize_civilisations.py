@@ -1,280 +1,208 @@
-import json
 import re
 
-def split_long_content(content_list, max_words=300):
-    """
-    Split long content blocks into smaller semantic chunks.
-    Tries to keep paragraphs together when possible.
-    """
-    chunks = []
-    current_chunk = []
-    current_word_count = 0
-    
-    for item in content_list:
-        word_count = len(item.split())
-        
-        # If adding this item would exceed max_words, save current chunk and start new
-        if current_word_count + word_count > max_words and current_chunk:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
-            current_word_count = 0
-        
-        current_chunk.append(item)
-        current_word_count += word_count
-    
-    # Add remaining content
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
-    
-    return chunks
+from .._data_io import DATA_DIR, load_json, write_chunks
+from .._pool import map_pages
+from ._chunk_utils import (
+    block,
+    extract_name as extract_civ_name,
+    partition,
+    split_long_content,
+)
 
+# Headings that always get the same handling, looked up before any pattern
+_EXACT_KINDS = {
+    "Introduction": "overview",
+    "Vanilla version[]": "strategy",
+    "Rise and Fall & Gathering Storm[]": "strategy",
+    "P-51 Mustang[]": "unique",
+    "Film Studio[]": "unique",
+    "Rough Rider[]": "unique",
+}
 
-def extract_civ_name(title):
-    """Extract civilization name from title like 'American (Civ6)'"""
-    match = re.match(r'(.+?)\s*\(Civ6\)', title)
-    return match.group(1) if match else title
+# Section heading keywords, matched against the lowercased heading
+_LEADER_RE = re.compile(r'roosevelt|lincoln|corollary|emancipation|antiquities')
+_UNIQUE_RE = re.compile(r'unit\[\]|building\[\]|infrastructure\[\]')
 
 
-def normalize_civilizations(data_list):
-    """
-    Normalize civilization data from Civ6 wiki for RAG use.
-    
-    Creates multiple chunk types:
-    1. Overview chunks - basic civ info
-    2. Leader ability chunks - each leader's specific abilities
-    3. Strategy chunks - gameplay advice split semantically
-    4. Unit/Building chunks - unique components
+def _classify(heading):
+    """Return the chunk type for a section heading"""
+    kind = _EXACT_KINDS.get(heading)
+    if kind:
+        return kind
     
-    Extracts:
-    - Title: Civilization name
-    - Section: Specific topic (Overview, Leader name, Strategy type, etc.)
-    - Key Facts: Short metadata and stats
-    - Main Content: Strategic advice and descriptions
-    - Source: Metadata string
-    """
+    # Patterns are checked in priority order, e.g. a leader's strategy
+    # section is still a leader ability
+    heading_lower = heading.lower()
+    if _LEADER_RE.search(heading_lower):
+        return "leader"
+    if 'strategy' in heading_lower:
+        return "strategy"
+    if _UNIQUE_RE.search(heading_lower):
+        return "unique"
+    if 'victory' in heading_lower or 'counter' in heading_lower:
+        return "advice"
+    return "other"
+
+
+def _normalize_one(data):
+    """Normalize a single civilization page into its list of chunks"""
     out = []
     
-    for data in data_list:
-        title = data.get("title", "")
-        source = data.get("source", "")
-        category = data.get("category", "")
-        url = data.get("url", "")
-        metadata = data.get("metadata", {})
-        
-        # Extract civilization name
-        civ_name = extract_civ_name(title)
+    title = data.get("title", "")
+    source = data.get("source", "")
+    category = data.get("category", "")
+    url = data.get("url", "")
+    metadata = data.get("metadata", {})
+    
+    # Extract civilization name
+    civ_name = extract_civ_name(title)
+    
+    # Skip the general "Civilizations (Civ6)" overview page
+    if civ_name == "Civilizations":
+        return out
+    
+    # Per-document lines, shared by every section below
+    title_line = f"Title: {civ_name}"
+    source_line = f"Source: {source}, {category}"
+    
+    for sec in data.get("sections", []):
+        heading = sec.get("heading", "")
+        section_name = heading.replace('[]', '').strip()
+        content_list = sec.get("content", [])
         
-        # Skip the general "Civilizations (Civ6)" overview page
-        if civ_name == "Civilizations":
+        if not content_list:
             continue
         
-        for sec in data.get("sections", []):
-            heading = sec.get("heading", "")
-            content_list = sec.get("content", [])
+        # Determine chunk type and handling based on heading
+        kind = _classify(heading)
+        
+        # === OVERVIEW CHUNKS ===
+        if kind == "overview":
+            # Split intro into overview and ability details
+            facts, main_content = partition(content_list)
             
-            if not content_list:
-                continue
+            # Metadata and short facts share one Key Facts block
+            key_facts = ["- " + f for f in facts]
+            if metadata:
+                key_facts = [f"- {key}: {value}" for key, value in metadata.items() if value] + key_facts
+            facts_block = block("Key Facts:", key_facts) if metadata or facts else ""
+            main_block = block("Main Content:", main_content) if main_content else ""
             
-            # Determine chunk type and handling based on heading
+            out.append(f"{title_line}\nSection: Overview{facts_block}{main_block}\n{source_line}")
+        
+        # === LEADER ABILITY CHUNKS ===
+        elif kind == "leader":
+            # These are leader-specific abilities or strategies
             
-            # === OVERVIEW CHUNKS ===
-            if heading == "Introduction":
-                # Split intro into overview and ability details
-                facts = []
-                main_content = []
-                
-                for item in content_list:
-                    if len(item) < 200:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                chunk.append(f"Title: {civ_name}")
-                chunk.append("Section: Overview")
-                
-                # Add metadata as key facts if available
-                if metadata:
-                    chunk.append("Key Facts:")
-                    for key, value in metadata.items():
-                        if value:
-                            chunk.append(f"- {key}: {value}")
-                
-                # Add short facts
-                if facts:
-                    if not metadata:
-                        chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}")
-                out.append("\n".join(chunk))
+            # If content is very long, split it semantically
+            word_counts = [len(item.split()) for item in content_list]
+            total_words = sum(word_counts)
             
-            # === LEADER ABILITY CHUNKS ===
-            elif any(leader_keyword in heading.lower() for leader_keyword in 
-                    ['roosevelt', 'lincoln', 'corollary', 'emancipation', 'antiquities']):
-                # These are leader-specific abilities or strategies
-                
-                # If content is very long, split it semantically
-                total_words = sum(len(item.split()) for item in content_list)
-                
-                if total_words > 300:
-                    # Split into smaller chunks
-                    content_chunks = split_long_content(content_list, max_words=300)
+            if total_words > 300:
+                # Split into smaller chunks
+                content_chunks = split_long_content(content_list, max_words=300, word_counts=word_counts)
+                
+                for i, chunk_content in enumerate(content_chunks):
+                    # Add part number if split into multiple chunks
+                    part_name = section_name
+                    if len(content_chunks) > 1:
+                        part_name = f"{section_name} (Part {i+1}/{len(content_chunks)})"
                     
-                    for i, chunk_content in enumerate(content_chunks):
-                        chunk = []
-                        chunk.append(f"Title: {civ_name}")
-                        
-                        # Add part number if split into multiple chunks
-                        section_name = heading.replace('[]', '').strip()
-                        if len(content_chunks) > 1:
-                            chunk.append(f"Section: {section_name} (Part {i+1}/{len(content_chunks)})")
-                        else:
-                            chunk.append(f"Section: {section_name}")
-                        
-                        chunk.append("Main Content:")
-                        chunk.append(chunk_content)
-                        chunk.append(f"Source: {source}, {category}, leader_ability")
-                        out.append("\n".join(chunk))
-                else:
-                    # Keep as single chunk
-                    chunk = []
-                    chunk.append(f"Title: {civ_name}")
-                    chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                    chunk.append("Main Content:")
-                    for item in content_list:
-                        chunk.append(item.strip())
-                    chunk.append(f"Source: {source}, {category}, leader_ability")
-                    out.append("\n".join(chunk))
+                    out.append(f"{title_line}\nSection: {part_name}\nMain Content:\n{chunk_content}\n{source_line}, leader_ability")
+            else:
+                # Keep as single chunk
+                main_block = block("Main Content:", [item.strip() for item in content_list])
+                out.append(f"{title_line}\nSection: {section_name}{main_block}\n{source_line}, leader_ability")
+        
+        # === STRATEGY CHUNKS ===
+        elif kind == "strategy":
+            # These are strategic advice sections
             
-            # === STRATEGY CHUNKS ===
-            elif 'strategy' in heading.lower() or heading in ['Vanilla version[]', 'Rise and Fall & Gathering Storm[]']:
-                # These are strategic advice sections
-                
-                total_words = sum(len(item.split()) for item in content_list)
+            word_counts = [len(item.split()) for item in content_list]
+            total_words = sum(word_counts)
+            
+            if total_words > 300:
+                content_chunks = split_long_content(content_list, max_words=300, word_counts=word_counts)
                 
-                if total_words > 300:
-                    content_chunks = split_long_content(content_list, max_words=300)
+                for i, chunk_content in enumerate(content_chunks):
+                    part_name = section_name
+                    if len(content_chunks) > 1:
+                        part_name = f"{section_name} (Part {i+1}/{len(content_chunks)})"
                     
-                    for i, chunk_content in enumerate(content_chunks):
-                        chunk = []
-                        chunk.append(f"Title: {civ_name}")
-                        
-                        section_name = heading.replace('[]', '').strip()
-                        if len(content_chunks) > 1:
-                            chunk.append(f"Section: Strategy - {section_name} (Part {i+1}/{len(content_chunks)})")
-                        else:
-                            chunk.append(f"Section: Strategy - {section_name}")
-                        
-                        chunk.append("Main Content:")
-                        chunk.append(chunk_content)
-                        chunk.append(f"Source: {source}, {category}, strategy")
-                        out.append("\n".join(chunk))
-                else:
-                    chunk = []
-                    chunk.append(f"Title: {civ_name}")
-                    chunk.append(f"Section: Strategy - {heading.replace('[]', '').strip()}")
-                    chunk.append("Main Content:")
-                    for item in content_list:
-                        chunk.append(item.strip())
-                    chunk.append(f"Source: {source}, {category}, strategy")
-                    out.append("\n".join(chunk))
+                    out.append(f"{title_line}\nSection: Strategy - {part_name}\nMain Content:\n{chunk_content}\n{source_line}, strategy")
+            else:
+                main_block = block("Main Content:", [item.strip() for item in content_list])
+                out.append(f"{title_line}\nSection: Strategy - {section_name}{main_block}\n{source_line}, strategy")
+        
+        # === UNIQUE UNIT/BUILDING CHUNKS ===
+        elif kind == "unique":
+            # Unique components
+            facts, main_content = partition(content_list, threshold=150)
             
-            # === UNIQUE UNIT/BUILDING CHUNKS ===
-            elif heading in ['P-51 Mustang[]', 'Film Studio[]', 'Rough Rider[]'] or \
-                 any(keyword in heading.lower() for keyword in ['unit[]', 'building[]', 'infrastructure[]']):
-                # Unique components
-                facts = []
-                main_content = []
-                
-                for item in content_list:
-                    if len(item) < 150:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                chunk.append(f"Title: {civ_name}")
-                chunk.append(f"Section: Unique Component - {heading.replace('[]', '').strip()}")
-                
-                if facts:
-                    chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}, unique_component")
-                out.append("\n".join(chunk))
+            facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+            main_block = block("Main Content:", main_content) if main_content else ""
             
-            # === VICTORY TYPE & COUNTER STRATEGY CHUNKS ===
-            elif 'victory' in heading.lower() or 'counter' in heading.lower():
-                chunk = []
-                chunk.append(f"Title: {civ_name}")
-                chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                chunk.append("Main Content:")
-                for item in content_list:
-                    chunk.append(item.strip())
-                chunk.append(f"Source: {source}, {category}, gameplay_advice")
-                out.append("\n".join(chunk))
+            out.append(f"{title_line}\nSection: Unique Component - {section_name}{facts_block}{main_block}\n{source_line}, unique_component")
+        
+        # === VICTORY TYPE & COUNTER STRATEGY CHUNKS ===
+        elif kind == "advice":
+            main_block = block("Main Content:", [item.strip() for item in content_list])
+            out.append(f"{title_line}\nSection: {section_name}{main_block}\n{source_line}, gameplay_advice")
+        
+        # === OTHER CHUNKS (Civilopedia, Trivia, etc.) ===
+        else:
+            # For remaining sections, use standard approach
+            facts, main_content = partition(content_list)
             
-            # === OTHER CHUNKS (Civilopedia, Trivia, etc.) ===
-            else:
-                # For remaining sections, use standard approach
-                facts = []
-                main_content = []
-                
-                for item in content_list:
-                    if len(item) < 200:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                chunk.append(f"Title: {civ_name}")
-                chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                
-                if facts:
-                    chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}")
-                out.append("\n".join(chunk))
+            facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+            main_block = block("Main Content:", main_content) if main_content else ""
+            
+            out.append(f"{title_line}\nSection: {section_name}{facts_block}{main_block}\n{source_line}")
     
     return out
 
 
+def normalize_civilizations(data_list, max_workers=1):
+    """
+    Normalize civilization data from Civ6 wiki for RAG use.
+    
+    Creates multiple chunk types:
+    1. Overview chunks - basic civ info
+    2. Leader ability chunks - each leader's specific abilities
+    3. Strategy chunks - gameplay advice split semantically
+    4. Unit/Building chunks - unique components
+    
+    Extracts:
+    - Title: Civilization name
+    - Section: Specific topic (Overview, Leader name, Strategy type, etc.)
+    - Key Facts: Short metadata and stats
+    - Main Content: Strategic advice and descriptions
+    - Source: Metadata string
+    
+    Pages run in the current process unless max_workers asks for worker
+    processes (None = one per CPU); see map_pages.
+    Repeated chunks are kept only once.
+    """
+    return map_pages(_normalize_one, data_list, max_workers)
+
+
 def main():
     # Load the civilization data
-    with open(r"C:\Users\jeanb\Documents\misc-code\PingalAI\data\raw\civ6_wiki\civ6_complete_data.json", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(DATA_DIR / "raw" / "civ6_wiki" / "civ6_complete_data.json")
     
-    # Normalize the civilization data
-    chunks = normalize_civilizations(data.get('civilizations', {}))
+    # Keep only the subtree this script uses so the rest of the dump can be freed
+    sub = data.get('civilizations', {})
+    del data
     
-    # Save as list of dictionaries with "text" key
-    saved = [{"text": c} for c in chunks]
+    # Normalize the civilization data
+    chunks = normalize_civilizations(sub)
     
-    with open(r"data\processed\official_wiki\civilizations.json", "w", encoding="utf-8") as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+    # Stream as a list of dictionaries with "text" key
+    out_path = DATA_DIR / "processed" / "official_wiki" / "civilizations.json"
+    write_chunks(chunks, out_path)
     
     print(f"Processed {len(chunks)} civilization chunks")
-    print(f"Saved to: data\\processed\\civ6\\civilizations.json")
+    print(f"Saved to: {out_path}")
 
 
 if __name__ == "__main__":
@@ -1,306 +1,188 @@
-import json
-import re
-
-def split_long_content(content_list, max_words=300):
-    """
-    Split long content blocks into smaller semantic chunks.
-    Tries to keep paragraphs together when possible.
-    """
-    chunks = []
-    current_chunk = []
-    current_word_count = 0
-    
-    for item in content_list:
-        word_count = len(item.split())
-        
-        # If adding this item would exceed max_words, save current chunk and start new
-        if current_word_count + word_count > max_words and current_chunk:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
-            current_word_count = 0
-        
-        current_chunk.append(item)
-        current_word_count += word_count
-    
-    # Add remaining content
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
-    
-    return chunks
+from .._data_io import DATA_DIR, load_json, write_chunks
+from .._pool import map_pages
+from ._chunk_utils import (
+    block,
+    extract_name as extract_district_name,
+    partition,
+    split_long_content,
+)
 
+# System page sections that explain the general district rules
+_MECHANICS_HEADINGS = frozenset([
+    "Introduction",
+    "What is a district?[]",
+    "What does a district do?[]",
+    "Building a district[]",
+    "Basic requirements[]",
+    "Suitable locations[]",
+])
 
-def extract_district_name(title):
-    """Extract district name from title like 'Acropolis (Civ6)'"""
-    match = re.match(r'(.+?)\s*\(Civ6\)', title)
-    return match.group(1) if match else title
+# Sections listing what can be built in a district
+_LIST_HEADINGS = frozenset(["Buildings[]", "Projects[]"])
 
 
-def normalize_districts(data_list):
-    """
-    Normalize district data from Civ6 wiki for RAG use.
+def _normalize_one(data):
+    """Normalize a single district page into its list of chunks"""
+    out = []
     
-    Creates multiple chunk types:
-    1. General system chunks - how districts work
-    2. Specific district chunks - individual district details
-    3. Strategy chunks - gameplay advice for districts
+    title = data.get("title", "")
+    source = data.get("source", "")
+    category = data.get("category", "")
+    url = data.get("url", "")
+    metadata = data.get("metadata", {})
     
-    Extracts:
-    - Title: District name or "District System"
-    - Section: Specific topic
-    - Key Facts: Short items, stats, requirements, adjacency bonuses
-    - Main Content: Detailed explanations and strategy
-    - Source: Metadata string
-    """
-    out = []
+    # Extract district name
+    district_name = extract_district_name(title)
     
-    for data in data_list:
-        title = data.get("title", "")
-        source = data.get("source", "")
-        category = data.get("category", "")
-        url = data.get("url", "")
-        metadata = data.get("metadata", {})
-        
-        # Extract district name
-        district_name = extract_district_name(title)
+    # Determine if this is a system page or specific district page
+    is_system_page = district_name in ["District", "List of districts in Civ6"]
+    
+    # Per-document lines, shared by every section below
+    title_line = "Title: District System" if is_system_page else f"Title: {district_name}"
+    source_line = f"Source: {source}, {category}"
+    
+    for sec in data.get("sections", []):
+        heading = sec.get("heading", "")
+        section_name = heading.replace('[]', '').strip()
+        content_list = sec.get("content", [])
         
-        # Determine if this is a system page or specific district page
-        is_system_page = district_name in ["District", "List of districts in Civ6"]
+        if not content_list:
+            continue
         
-        for sec in data.get("sections", []):
-            heading = sec.get("heading", "")
-            content_list = sec.get("content", [])
-            
-            if not content_list:
-                continue
-            
-            # === SYSTEM PAGES (General Information) ===
-            if is_system_page:
-                system_title = "District System"
+        # === SYSTEM PAGES (General Information) ===
+        if is_system_page:
+            # Handle different section types
+            if heading in _MECHANICS_HEADINGS:
+                # General mechanics and rules
+                word_counts = [len(item.split()) for item in content_list]
+                total_words = sum(word_counts)
                 
-                # Handle different section types
-                if heading in ["Introduction", "What is a district?[]", "What does a district do?[]", 
-                              "Building a district[]", "Basic requirements[]", "Suitable locations[]"]:
-                    # General mechanics and rules
-                    total_words = sum(len(item.split()) for item in content_list)
-                    
-                    if total_words > 300:
-                        # Split long sections
-                        content_chunks = split_long_content(content_list, max_words=300)
-                        
-                        for i, chunk_content in enumerate(content_chunks):
-                            chunk = []
-                            chunk.append(f"Title: {system_title}")
-                            
-                            section_name = heading.replace('[]', '').strip()
-                            if len(content_chunks) > 1:
-                                chunk.append(f"Section: {section_name} (Part {i+1}/{len(content_chunks)})")
-                            else:
-                                chunk.append(f"Section: {section_name}")
-                            
-                            chunk.append("Main Content:")
-                            chunk.append(chunk_content)
-                            chunk.append(f"Source: {source}, {category}, game_mechanics")
-                            out.append("\n".join(chunk))
-                    else:
-                        facts = []
-                        main_content = []
-                        
-                        for item in content_list:
-                            if len(item) < 200:
-                                facts.append(item.strip())
-                            else:
-                                main_content.append(item.strip())
+                if total_words > 300:
+                    # Split long sections
+                    content_chunks = split_long_content(content_list, max_words=300, word_counts=word_counts)
+                    
+                    for i, chunk_content in enumerate(content_chunks):
+                        part_name = section_name
+                        if len(content_chunks) > 1:
+                            part_name = f"{section_name} (Part {i+1}/{len(content_chunks)})"
                         
-                        chunk = []
-                        chunk.append(f"Title: {system_title}")
-                        chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                        
-                        if facts:
-                            chunk.append("Key Facts:")
-                            for f in facts:
-                                chunk.append(f"- {f}")
-                        
-                        if main_content:
-                            chunk.append("Main Content:")
-                            for m in main_content:
-                                chunk.append(m)
-                        
-                        chunk.append(f"Source: {source}, {category}, game_mechanics")
-                        out.append("\n".join(chunk))
-                
+                        out.append(f"{title_line}\nSection: {part_name}\nMain Content:\n{chunk_content}\n{source_line}, game_mechanics")
                 else:
-                    # Other system sections
-                    facts = []
-                    main_content = []
-                    
-                    for item in content_list:
-                        if len(item) < 200:
-                            facts.append(item.strip())
-                        else:
-                            main_content.append(item.strip())
+                    facts, main_content = partition(content_list)
                     
-                    chunk = []
-                    chunk.append(f"Title: {system_title}")
-                    chunk.append(f"Section: {heading.replace('[]', '').strip()}")
+                    facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+                    main_block = block("Main Content:", main_content) if main_content else ""
                     
-                    if facts:
-                        chunk.append("Key Facts:")
-                        for f in facts:
-                            chunk.append(f"- {f}")
-                    
-                    if main_content:
-                        chunk.append("Main Content:")
-                        for m in main_content:
-                            chunk.append(m)
-                    
-                    chunk.append(f"Source: {source}, {category}")
-                    out.append("\n".join(chunk))
+                    out.append(f"{title_line}\nSection: {section_name}{facts_block}{main_block}\n{source_line}, game_mechanics")
             
-            # === SPECIFIC DISTRICT PAGES ===
             else:
-                # This is a specific district (like "Acropolis (Civ6)")
+                # Other system sections
+                facts, main_content = partition(content_list)
                 
-                if heading == "Introduction":
-                    # Create overview chunk with stats and basic info
-                    facts = []
-                    main_content = []
-                    
-                    # Add metadata as key facts
-                    if metadata:
-                        for key, value in metadata.items():
-                            if value:
-                                facts.append(f"{key}: {value}")
-                    
-                    # Process content - many have structured stat blocks
-                    for item in content_list:
-                        # Check if this is a stat line (short and likely contains numbers or yields)
-                        if len(item) < 150 and (any(char.isdigit() for char in item) or 
-                                               any(keyword in item.lower() for keyword in 
-                                                   ['cost', 'yield', 'bonus', 'point', 'adjacency', 'slot'])):
-                            facts.append(item.strip())
-                        elif len(item) < 200:
-                            facts.append(item.strip())
-                        else:
-                            main_content.append(item.strip())
-                    
-                    chunk = []
-                    chunk.append(f"Title: {district_name}")
-                    chunk.append("Section: Overview")
-                    
-                    if facts:
-                        chunk.append("Key Facts:")
-                        for f in facts:
-                            chunk.append(f"- {f}")
-                    
-                    if main_content:
-                        chunk.append("Main Content:")
-                        for m in main_content:
-                            chunk.append(m)
-                    
-                    chunk.append(f"Source: {source}, {category}")
-                    out.append("\n".join(chunk))
+                facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+                main_block = block("Main Content:", main_content) if main_content else ""
                 
-                elif heading in ["Buildings[]", "Projects[]"]:
-                    # List of buildings or projects available in this district
-                    chunk = []
-                    chunk.append(f"Title: {district_name}")
-                    chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                    chunk.append("Key Facts:")
-                    for item in content_list:
-                        if item.strip():
-                            chunk.append(f"- {item.strip()}")
-                    chunk.append(f"Source: {source}, {category}")
-                    out.append("\n".join(chunk))
+                out.append(f"{title_line}\nSection: {section_name}{facts_block}{main_block}\n{source_line}")
+        
+        # === SPECIFIC DISTRICT PAGES ===
+        else:
+            # This is a specific district (like "Acropolis (Civ6)")
+            
+            if heading == "Introduction":
+                # Create overview chunk with stats and basic info
+                facts, main_content = partition(content_list)
                 
-                elif heading == "Strategy[]":
-                    # Strategy for using this specific district
-                    total_words = sum(len(item.split()) for item in content_list)
-                    
-                    if total_words > 300:
-                        # Split long strategy sections
-                        content_chunks = split_long_content(content_list, max_words=300)
-                        
-                        for i, chunk_content in enumerate(content_chunks):
-                            chunk = []
-                            chunk.append(f"Title: {district_name}")
-                            
-                            if len(content_chunks) > 1:
-                                chunk.append(f"Section: Strategy (Part {i+1}/{len(content_chunks)})")
-                            else:
-                                chunk.append("Section: Strategy")
-                            
-                            chunk.append("Main Content:")
-                            chunk.append(chunk_content)
-                            chunk.append(f"Source: {source}, {category}, strategy")
-                            out.append("\n".join(chunk))
-                    else:
-                        chunk = []
-                        chunk.append(f"Title: {district_name}")
-                        chunk.append("Section: Strategy")
-                        chunk.append("Main Content:")
-                        for item in content_list:
-                            chunk.append(item.strip())
-                        chunk.append(f"Source: {source}, {category}, strategy")
-                        out.append("\n".join(chunk))
+                # Metadata goes first in the key facts. Stat lines are short,
+                # so they always land in the facts with the other short items.
+                if metadata:
+                    facts = [f"{key}: {value}" for key, value in metadata.items() if value] + facts
                 
-                elif heading == "Civilopedia entry[]":
-                    # Historical/flavor text
-                    chunk = []
-                    chunk.append(f"Title: {district_name}")
-                    chunk.append("Section: Historical Background")
-                    chunk.append("Main Content:")
-                    for item in content_list:
-                        chunk.append(item.strip())
-                    chunk.append(f"Source: {source}, {category}, history")
-                    out.append("\n".join(chunk))
+                facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+                main_block = block("Main Content:", main_content) if main_content else ""
                 
+                out.append(f"{title_line}\nSection: Overview{facts_block}{main_block}\n{source_line}")
+            
+            elif heading in _LIST_HEADINGS:
+                # List of buildings or projects available in this district
+                facts_block = block("Key Facts:", ["- " + item.strip() for item in content_list if item.strip()])
+                out.append(f"{title_line}\nSection: {section_name}{facts_block}\n{source_line}")
+            
+            elif heading == "Strategy[]":
+                # Strategy for using this specific district
+                word_counts = [len(item.split()) for item in content_list]
+                total_words = sum(word_counts)
+                
+                if total_words > 300:
+                    # Split long strategy sections
+                    content_chunks = split_long_content(content_list, max_words=300, word_counts=word_counts)
+                    
+                    for i, chunk_content in enumerate(content_chunks):
+                        part_name = "Strategy"
+                        if len(content_chunks) > 1:
+                            part_name = f"Strategy (Part {i+1}/{len(content_chunks)})"
+                        
+                        out.append(f"{title_line}\nSection: {part_name}\nMain Content:\n{chunk_content}\n{source_line}, strategy")
                 else:
-                    # Other sections (version-specific mechanics, etc.)
-                    facts = []
-                    main_content = []
-                    
-                    for item in content_list:
-                        if len(item) < 200:
-                            facts.append(item.strip())
-                        else:
-                            main_content.append(item.strip())
-                    
-                    chunk = []
-                    chunk.append(f"Title: {district_name}")
-                    chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                    
-                    if facts:
-                        chunk.append("Key Facts:")
-                        for f in facts:
-                            chunk.append(f"- {f}")
-                    
-                    if main_content:
-                        chunk.append("Main Content:")
-                        for m in main_content:
-                            chunk.append(m)
-                    
-                    chunk.append(f"Source: {source}, {category}")
-                    out.append("\n".join(chunk))
+                    main_block = block("Main Content:", [item.strip() for item in content_list])
+                    out.append(f"{title_line}\nSection: Strategy{main_block}\n{source_line}, strategy")
+            
+            elif heading == "Civilopedia entry[]":
+                # Historical/flavor text
+                main_block = block("Main Content:", [item.strip() for item in content_list])
+                out.append(f"{title_line}\nSection: Historical Background{main_block}\n{source_line}, history")
+            
+            else:
+                # Other sections (version-specific mechanics, etc.)
+                facts, main_content = partition(content_list)
+                
+                facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+                main_block = block("Main Content:", main_content) if main_content else ""
+                
+                out.append(f"{title_line}\nSection: {section_name}{facts_block}{main_block}\n{source_line}")
     
     return out
 
 
+def normalize_districts(data_list, max_workers=1):
+    """
+    Normalize district data from Civ6 wiki for RAG use.
+    
+    Creates multiple chunk types:
+    1. General system chunks - how districts work
+    2. Specific district chunks - individual district details
+    3. Strategy chunks - gameplay advice for districts
+    
+    Extracts:
+    - Title: District name or "District System"
+    - Section: Specific topic
+    - Key Facts: Short items, stats, requirements, adjacency bonuses
+    - Main Content: Detailed explanations and strategy
+    - Source: Metadata string
+    
+    Pages run in the current process unless max_workers asks for worker
+    processes (None = one per CPU); see map_pages.
+    Repeated chunks are kept only once.
+    """
+    return map_pages(_normalize_one, data_list, max_workers)
+
+
 def main():
     # Load the districts data
-    with open(r"C:\Users\jeanb\Documents\misc-code\PingalAI\data\raw\civ6_wiki\civ6_complete_data.json", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(DATA_DIR / "raw" / "civ6_wiki" / "civ6_complete_data.json")
     
-    # Normalize the districts data
-    chunks = normalize_districts(data.get('districts', {}))
+    # Keep only the subtree this script uses so the rest of the dump can be freed
+    sub = data.get('districts', {})
+    del data
     
-    # Save as list of dictionaries with "text" key
-    saved = [{"text": c} for c in chunks]
+    # Normalize the districts data
+    chunks = normalize_districts(sub)
     
-    with open(r"data\processed\official_wiki\districts.json", "w", encoding="utf-8") as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+    # Stream as a list of dictionaries with "text" key
+    out_path = DATA_DIR / "processed" / "official_wiki" / "districts.json"
+    write_chunks(chunks, out_path)
     
     print(f"Processed {len(chunks)} district chunks")
-    print(f"Saved to: data\\processed\\official_wiki\\districts.json")
+    print(f"Saved to: {out_path}")
 
 
 if __name__ == "__main__":
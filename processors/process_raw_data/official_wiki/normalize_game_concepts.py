@@ -1,41 +1,88 @@
-import json
 import re
 
-def split_long_content(content_list, max_words=300):
-    """
-    Split long content blocks into smaller semantic chunks.
-    Tries to keep paragraphs together when possible.
-    """
-    chunks = []
-    current_chunk = []
-    current_word_count = 0
+from .._data_io import DATA_DIR, load_json, write_chunks
+from .._pool import map_pages
+from ._chunk_utils import (
+    block,
+    extract_name as extract_concept_name,
+    partition,
+    split_long_content,
+)
+
+# Section heading keywords
+_MECHANIC_RE = re.compile(r'what are|what is|mechanics|how it works|how to', re.IGNORECASE)
+_AFFECTED_RE = re.compile(r'affected by|elements', re.IGNORECASE)
+
+
+def _normalize_one(data):
+    """Normalize a single game concept page into its list of chunks"""
+    out = []
+    
+    title = data.get("title", "")
+    source = data.get("source", "")
+    category = data.get("category", "")
+    url = data.get("url", "")
+    metadata = data.get("metadata", {})
     
-    for item in content_list:
-        word_count = len(item.split())
+    # Extract concept name
+    concept_name = extract_concept_name(title)
+    
+    # Per-document lines, shared by every section below
+    title_line = f"Title: {concept_name}"
+    source_line = f"Source: {source}, {category}, game_mechanics"
+    
+    for sec in data.get("sections", []):
+        heading = sec.get("heading", "")
+        # Strip every item once; blank items are dropped
+        content_list = [item for item in (raw.strip() for raw in sec.get("content") or ()) if item]
         
-        # If adding this item would exceed max_words, save current chunk and start new
-        if current_word_count + word_count > max_words and current_chunk:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
-            current_word_count = 0
+        if not content_list:
+            continue
         
-        current_chunk.append(item)
-        current_word_count += word_count
-    
-    # Add remaining content
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+        # All game concepts are system explanations
+        # Determine how to handle each section
+        section_name = heading.replace('[]', '').strip()
+        
+        if heading == "Introduction":
+            # Overview of the concept
+            section_name = "Overview"
+            can_split = False
+        
+        elif _MECHANIC_RE.search(heading):
+            # Core mechanic explanations, split if long
+            can_split = True
+        
+        elif _AFFECTED_RE.search(heading):
+            # Lists of affected elements or subsystems
+            can_split = False
+        
+        else:
+            # Sub-mechanics, specific aspects, or detailed rules, split if long
+            can_split = True
+        
+        word_counts = [len(item.split()) for item in content_list] if can_split else None
+        
+        if word_counts and sum(word_counts) > 300:
+            content_chunks = split_long_content(content_list, max_words=300, word_counts=word_counts)
+            
+            for i, chunk_content in enumerate(content_chunks):
+                part_name = section_name
+                if len(content_chunks) > 1:
+                    part_name = f"{section_name} (Part {i+1}/{len(content_chunks)})"
+                
+                out.append(f"{title_line}\nSection: {part_name}\nMain Content:\n{chunk_content}\n{source_line}")
+        else:
+            facts, main_content = partition(content_list, strip=False)
+            
+            facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+            main_block = block("Main Content:", main_content) if main_content else ""
+            
+            out.append(f"{title_line}\nSection: {section_name}{facts_block}{main_block}\n{source_line}")
     
-    return chunks
-
-
-def extract_concept_name(title):
-    """Extract concept name from title like 'Adjacency bonus (Civ6)'"""
-    match = re.match(r'(.+?)\s*\(Civ6\)', title)
-    return match.group(1) if match else title
+    return out
 
 
-def normalize_game_concepts(data_list):
+def normalize_game_concepts(data_list, max_workers=1):
     """
     Normalize game concepts data from Civ6 wiki for RAG use.
     
@@ -53,203 +100,31 @@ def normalize_game_concepts(data_list):
     - Key Facts: Short bullet points and rules
     - Main Content: Detailed explanations
     - Source: Metadata string
-    """
-    out = []
     
-    for data in data_list:
-        title = data.get("title", "")
-        source = data.get("source", "")
-        category = data.get("category", "")
-        url = data.get("url", "")
-        metadata = data.get("metadata", {})
-        
-        # Extract concept name
-        concept_name = extract_concept_name(title)
-        
-        for sec in data.get("sections", []):
-            heading = sec.get("heading", "")
-            content_list = sec.get("content", [])
-            
-            if not content_list:
-                continue
-            
-            # All game concepts are system explanations
-            # Determine how to handle each section
-            
-            if heading == "Introduction":
-                # Overview of the concept
-                facts = []
-                main_content = []
-                
-                for item in content_list:
-                    if len(item) < 200:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                chunk.append(f"Title: {concept_name}")
-                chunk.append("Section: Overview")
-                
-                if facts:
-                    chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}, game_mechanics")
-                out.append("\n".join(chunk))
-            
-            elif any(keyword in heading.lower() for keyword in 
-                    ["what are", "what is", "mechanics", "how it works", "how to"]):
-                # Core mechanic explanations
-                total_words = sum(len(item.split()) for item in content_list)
-                
-                if total_words > 300:
-                    # Split long mechanic explanations
-                    content_chunks = split_long_content(content_list, max_words=300)
-                    
-                    for i, chunk_content in enumerate(content_chunks):
-                        chunk = []
-                        chunk.append(f"Title: {concept_name}")
-                        
-                        section_name = heading.replace('[]', '').strip()
-                        if len(content_chunks) > 1:
-                            chunk.append(f"Section: {section_name} (Part {i+1}/{len(content_chunks)})")
-                        else:
-                            chunk.append(f"Section: {section_name}")
-                        
-                        chunk.append("Main Content:")
-                        chunk.append(chunk_content)
-                        chunk.append(f"Source: {source}, {category}, game_mechanics")
-                        out.append("\n".join(chunk))
-                else:
-                    facts = []
-                    main_content = []
-                    
-                    for item in content_list:
-                        if len(item) < 200:
-                            facts.append(item.strip())
-                        else:
-                            main_content.append(item.strip())
-                    
-                    chunk = []
-                    chunk.append(f"Title: {concept_name}")
-                    chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                    
-                    if facts:
-                        chunk.append("Key Facts:")
-                        for f in facts:
-                            chunk.append(f"- {f}")
-                    
-                    if main_content:
-                        chunk.append("Main Content:")
-                        for m in main_content:
-                            chunk.append(m)
-                    
-                    chunk.append(f"Source: {source}, {category}, game_mechanics")
-                    out.append("\n".join(chunk))
-            
-            elif "affected by" in heading.lower() or "elements" in heading.lower():
-                # Lists of affected elements or subsystems
-                facts = []
-                main_content = []
-                
-                for item in content_list:
-                    if len(item) < 200:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                chunk.append(f"Title: {concept_name}")
-                chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                
-                if facts:
-                    chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}, game_mechanics")
-                out.append("\n".join(chunk))
-            
-            else:
-                # Sub-mechanics, specific aspects, or detailed rules
-                total_words = sum(len(item.split()) for item in content_list)
-                
-                if total_words > 300:
-                    # Split long sections
-                    content_chunks = split_long_content(content_list, max_words=300)
-                    
-                    for i, chunk_content in enumerate(content_chunks):
-                        chunk = []
-                        chunk.append(f"Title: {concept_name}")
-                        
-                        section_name = heading.replace('[]', '').strip()
-                        if len(content_chunks) > 1:
-                            chunk.append(f"Section: {section_name} (Part {i+1}/{len(content_chunks)})")
-                        else:
-                            chunk.append(f"Section: {section_name}")
-                        
-                        chunk.append("Main Content:")
-                        chunk.append(chunk_content)
-                        chunk.append(f"Source: {source}, {category}, game_mechanics")
-                        out.append("\n".join(chunk))
-                else:
-                    facts = []
-                    main_content = []
-                    
-                    for item in content_list:
-                        if len(item) < 200:
-                            facts.append(item.strip())
-                        else:
-                            main_content.append(item.strip())
-                    
-                    chunk = []
-                    chunk.append(f"Title: {concept_name}")
-                    chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                    
-                    if facts:
-                        chunk.append("Key Facts:")
-                        for f in facts:
-                            chunk.append(f"- {f}")
-                    
-                    if main_content:
-                        chunk.append("Main Content:")
-                        for m in main_content:
-                            chunk.append(m)
-                    
-                    chunk.append(f"Source: {source}, {category}, game_mechanics")
-                    out.append("\n".join(chunk))
-    
-    return out
+    Pages run in the current process unless max_workers asks for worker
+    processes (None = one per CPU); see map_pages.
+    Repeated chunks are kept only once.
+    """
+    return map_pages(_normalize_one, data_list, max_workers)
 
 
 def main():
     # Load the game concepts data
-    with open(r"C:\Users\jeanb\Documents\misc-code\PingalAI\data\raw\civ6_wiki\civ6_complete_data.json", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(DATA_DIR / "raw" / "civ6_wiki" / "civ6_complete_data.json")
     
-    # Normalize the game concepts data
-    chunks = normalize_game_concepts(data.get('game_concepts', {}))
+    # Keep only the subtree this script uses so the rest of the dump can be freed
+    sub = data.get('game_concepts', {})
+    del data
     
-    # Save as list of dictionaries with "text" key
-    saved = [{"text": c} for c in chunks]
+    # Normalize the game concepts data
+    chunks = normalize_game_concepts(sub)
     
-    with open(r"data\processed\official_wiki\game_concepts.json", "w", encoding="utf-8") as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+    # Stream as a list of dictionaries with "text" key
+    out_path = DATA_DIR / "processed" / "official_wiki" / "game_concepts.json"
+    write_chunks(chunks, out_path)
     
     print(f"Processed {len(chunks)} game concept chunks")
-    print(f"Saved to: data\\processed\\official_wiki\\game_concepts.json")
+    print(f"Saved to: {out_path}")
 
 
 if __name__ == "__main__":
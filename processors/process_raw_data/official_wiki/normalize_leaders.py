@@ -1,41 +1,145 @@
-import json
-import re
+from .._data_io import DATA_DIR, load_json, write_chunks
+from .._pool import map_pages
+from ._chunk_utils import (
+    block,
+    extract_name as extract_leader_name,
+    partition,
+    split_long_content,
+)
 
-def split_long_content(content_list, max_words=300):
-    """
-    Split long content blocks into smaller semantic chunks.
-    Tries to keep paragraphs together when possible.
-    """
-    chunks = []
-    current_chunk = []
-    current_word_count = 0
+# Strategy sections, written as one chunk each
+_INGAME = frozenset(["In-Game[]", "Detailed Approach[]"])
+
+# Dialogue sections, one quote per line
+_DIALOGUE = frozenset(["Lines[]", "Unvoiced[]", "Voiced[]"])
+
+
+def _normalize_one(data):
+    """Normalize a single leader page into its list of chunks"""
+    out = []
+    
+    title = data.get("title", "")
+    source = data.get("source", "")
+    category = data.get("category", "")
+    url = data.get("url", "")
+    metadata = data.get("metadata", {})
+    
+    # Extract leader name
+    leader_name = extract_leader_name(title)
+    
+    # Skip the general "Leaders (Civ6)" overview page
+    if leader_name == "Leaders":
+        return out
+    
+    # Per-document lines, shared by every section below
+    title_line = f"Title: {leader_name}"
+    source_line = f"Source: {source}, {category}"
     
-    for item in content_list:
-        word_count = len(item.split())
+    for sec in data.get("sections", []):
+        heading = sec.get("heading", "")
+        section_name = heading.replace('[]', '').strip()
+        # Strip every item once; blank items are dropped
+        content_list = [item for item in (raw.strip() for raw in sec.get("content") or ()) if item]
         
-        # If adding this item would exceed max_words, save current chunk and start new
-        if current_word_count + word_count > max_words and current_chunk:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
-            current_word_count = 0
+        if not content_list:
+            continue
         
-        current_chunk.append(item)
-        current_word_count += word_count
-    
-    # Add remaining content
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+        # Determine chunk type and handling based on heading
+        
+        # === OVERVIEW CHUNKS (Introduction) ===
+        if heading == "Introduction":
+            facts = []
+            main_content = []
+            
+            # Extract metadata as facts
+            if metadata:
+                for key, value in metadata.items():
+                    if value and key:  # Skip empty keys or values
+                        facts.append(f"{key}: {value}")
+            
+            # Process content - first item usually has structured info
+            for i, item in enumerate(content_list):
+                # First item often contains structured leader bonus/agenda info
+                if i == 0 and len(item) > 200:
+                    # This is the detailed intro with abilities
+                    facts.append(item)
+                elif len(item) < 200:
+                    facts.append(item)
+                else:
+                    main_content.append(item)
+            
+            facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+            main_block = block("Main Content:", main_content) if main_content else ""
+            
+            out.append(f"{title_line}\nSection: Overview{facts_block}{main_block}\n{source_line}")
+        
+        # === IN-GAME MECHANICS ===
+        elif heading in _INGAME:
+            if heading == "In-Game[]":
+                section_name = "Abilities and Agenda Details"
+            else:
+                section_name = "Strategy and Approach"
+            
+            main_block = block("Main Content:", content_list)
+            out.append(f"{title_line}\nSection: {section_name}{main_block}\n{source_line}, strategy")
+        
+        # === INTRO FLAVOR TEXT ===
+        elif heading == "Intro[]":
+            main_block = block("Main Content:", content_list)
+            out.append(f"{title_line}\nSection: Leader Introduction{main_block}\n{source_line}, flavor_text")
+        
+        # === DIALOGUE/QUOTES ===
+        elif heading in _DIALOGUE:
+            # Group dialogue into a single chunk per section
+            facts_block = block("Key Facts:", ["- " + item for item in content_list])
+            out.append(f"{title_line}\nSection: Dialogue - {section_name}{facts_block}\n{source_line}, dialogue")
+        
+        # === CIVILOPEDIA (Historical Background) ===
+        elif heading == "Civilopedia entry[]":
+            # This is often very long - split it intelligently
+            word_counts = [len(item.split()) for item in content_list]
+            total_words = sum(word_counts)
+            
+            if total_words > 400:
+                # Split into multiple chunks
+                content_chunks = split_long_content(content_list, max_words=350, word_counts=word_counts)
+                
+                for i, chunk_content in enumerate(content_chunks):
+                    part_name = "Historical Background"
+                    if len(content_chunks) > 1:
+                        part_name = f"Historical Background (Part {i+1}/{len(content_chunks)})"
+                    
+                    out.append(f"{title_line}\nSection: {part_name}\nMain Content:\n{chunk_content}\n{source_line}, history")
+            else:
+                # Keep as single chunk
+                main_block = block("Main Content:", content_list)
+                out.append(f"{title_line}\nSection: Historical Background{main_block}\n{source_line}, history")
+        
+        # === TRIVIA ===
+        elif heading == "Trivia[]":
+            facts_block = block("Key Facts:", ["- " + item for item in content_list])
+            out.append(f"{title_line}\nSection: Trivia{facts_block}\n{source_line}, trivia")
+        
+        # === EXTERNAL LINKS ===
+        elif heading == "External links[]":
+            # Usually not needed for RAG, but include if present
+            facts_block = block("Key Facts:", ["- " + item for item in content_list])
+            out.append(f"{title_line}\nSection: External Links{facts_block}\n{source_line}, reference")
+        
+        # === OTHER SECTIONS ===
+        else:
+            # Handle any other sections generically
+            facts, main_content = partition(content_list, strip=False)
+            
+            facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+            main_block = block("Main Content:", main_content) if main_content else ""
+            
+            out.append(f"{title_line}\nSection: {section_name}{facts_block}{main_block}\n{source_line}")
     
-    return chunks
-
-
-def extract_leader_name(title):
-    """Extract leader name from title like 'Abraham Lincoln (Civ6)'"""
-    match = re.match(r'(.+?)\s*\(Civ6\)', title)
-    return match.group(1) if match else title
+    return out
 
 
-def normalize_leaders(data_list):
+def normalize_leaders(data_list, max_workers=1):
     """
     Normalize leader data from Civ6 wiki for RAG use.
     
@@ -51,216 +155,31 @@ def normalize_leaders(data_list):
     - Key Facts: Abilities, agenda, stats
     - Main Content: Strategic advice and descriptions
     - Source: Metadata string
-    """
-    out = []
     
-    for data in data_list:
-        title = data.get("title", "")
-        source = data.get("source", "")
-        category = data.get("category", "")
-        url = data.get("url", "")
-        metadata = data.get("metadata", {})
-        
-        # Extract leader name
-        leader_name = extract_leader_name(title)
-        
-        # Skip the general "Leaders (Civ6)" overview page
-        if leader_name == "Leaders":
-            continue
-        
-        for sec in data.get("sections", []):
-            heading = sec.get("heading", "")
-            content_list = sec.get("content", [])
-            
-            if not content_list:
-                continue
-            
-            # Determine chunk type and handling based on heading
-            
-            # === OVERVIEW CHUNKS (Introduction) ===
-            if heading == "Introduction":
-                facts = []
-                main_content = []
-                
-                # Extract metadata as facts
-                if metadata:
-                    for key, value in metadata.items():
-                        if value and key:  # Skip empty keys or values
-                            facts.append(f"{key}: {value}")
-                
-                # Process content - first item usually has structured info
-                for i, item in enumerate(content_list):
-                    # First item often contains structured leader bonus/agenda info
-                    if i == 0 and len(item) > 200:
-                        # This is the detailed intro with abilities
-                        facts.append(item.strip())
-                    elif len(item) < 200:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                chunk.append(f"Title: {leader_name}")
-                chunk.append("Section: Overview")
-                
-                if facts:
-                    chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}")
-                out.append("\n".join(chunk))
-            
-            # === IN-GAME MECHANICS ===
-            elif heading in ["In-Game[]", "Detailed Approach[]"]:
-                chunk = []
-                chunk.append(f"Title: {leader_name}")
-                
-                if heading == "In-Game[]":
-                    chunk.append("Section: Abilities and Agenda Details")
-                else:
-                    chunk.append("Section: Strategy and Approach")
-                
-                chunk.append("Main Content:")
-                for item in content_list:
-                    chunk.append(item.strip())
-                
-                chunk.append(f"Source: {source}, {category}, strategy")
-                out.append("\n".join(chunk))
-            
-            # === INTRO FLAVOR TEXT ===
-            elif heading == "Intro[]":
-                chunk = []
-                chunk.append(f"Title: {leader_name}")
-                chunk.append("Section: Leader Introduction")
-                chunk.append("Main Content:")
-                for item in content_list:
-                    chunk.append(item.strip())
-                chunk.append(f"Source: {source}, {category}, flavor_text")
-                out.append("\n".join(chunk))
-            
-            # === DIALOGUE/QUOTES ===
-            elif heading in ["Lines[]", "Unvoiced[]", "Voiced[]"]:
-                # Group dialogue into a single chunk per section
-                chunk = []
-                chunk.append(f"Title: {leader_name}")
-                chunk.append(f"Section: Dialogue - {heading.replace('[]', '').strip()}")
-                chunk.append("Key Facts:")
-                for item in content_list:
-                    chunk.append(f"- {item.strip()}")
-                chunk.append(f"Source: {source}, {category}, dialogue")
-                out.append("\n".join(chunk))
-            
-            # === CIVILOPEDIA (Historical Background) ===
-            elif heading == "Civilopedia entry[]":
-                # This is often very long - split it intelligently
-                total_words = sum(len(item.split()) for item in content_list)
-                
-                if total_words > 400:
-                    # Split into multiple chunks
-                    content_chunks = split_long_content(content_list, max_words=350)
-                    
-                    for i, chunk_content in enumerate(content_chunks):
-                        chunk = []
-                        chunk.append(f"Title: {leader_name}")
-                        
-                        if len(content_chunks) > 1:
-                            chunk.append(f"Section: Historical Background (Part {i+1}/{len(content_chunks)})")
-                        else:
-                            chunk.append("Section: Historical Background")
-                        
-                        chunk.append("Main Content:")
-                        chunk.append(chunk_content)
-                        chunk.append(f"Source: {source}, {category}, history")
-                        out.append("\n".join(chunk))
-                else:
-                    # Keep as single chunk
-                    chunk = []
-                    chunk.append(f"Title: {leader_name}")
-                    chunk.append("Section: Historical Background")
-                    chunk.append("Main Content:")
-                    for item in content_list:
-                        chunk.append(item.strip())
-                    chunk.append(f"Source: {source}, {category}, history")
-                    out.append("\n".join(chunk))
-            
-            # === TRIVIA ===
-            elif heading == "Trivia[]":
-                chunk = []
-                chunk.append(f"Title: {leader_name}")
-                chunk.append("Section: Trivia")
-                chunk.append("Key Facts:")
-                for item in content_list:
-                    if item.strip():
-                        chunk.append(f"- {item.strip()}")
-                chunk.append(f"Source: {source}, {category}, trivia")
-                out.append("\n".join(chunk))
-            
-            # === EXTERNAL LINKS ===
-            elif heading == "External links[]":
-                # Usually not needed for RAG, but include if present
-                chunk = []
-                chunk.append(f"Title: {leader_name}")
-                chunk.append("Section: External Links")
-                chunk.append("Key Facts:")
-                for item in content_list:
-                    chunk.append(f"- {item.strip()}")
-                chunk.append(f"Source: {source}, {category}, reference")
-                out.append("\n".join(chunk))
-            
-            # === OTHER SECTIONS ===
-            else:
-                # Handle any other sections generically
-                facts = []
-                main_content = []
-                
-                for item in content_list:
-                    if len(item) < 200:
-                        facts.append(item.strip())
-                    else:
-                        main_content.append(item.strip())
-                
-                chunk = []
-                chunk.append(f"Title: {leader_name}")
-                chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                
-                if facts:
-                    chunk.append("Key Facts:")
-                    for f in facts:
-                        chunk.append(f"- {f}")
-                
-                if main_content:
-                    chunk.append("Main Content:")
-                    for m in main_content:
-                        chunk.append(m)
-                
-                chunk.append(f"Source: {source}, {category}")
-                out.append("\n".join(chunk))
-    
-    return out
+    Pages run in the current process unless max_workers asks for worker
+    processes (None = one per CPU); see map_pages.
+    Repeated chunks are kept only once.
+    """
+    return map_pages(_normalize_one, data_list, max_workers)
 
 
 def main():
     # Load the leaders data
-    with open(r"C:\Users\jeanb\Documents\misc-code\PingalAI\data\raw\civ6_wiki\civ6_complete_data.json", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(DATA_DIR / "raw" / "civ6_wiki" / "civ6_complete_data.json")
     
-    # Normalize the leaders data
-    chunks = normalize_leaders(data.get('leaders', {}))
+    # Keep only the subtree this script uses so the rest of the dump can be freed
+    sub = data.get('leaders', {})
+    del data
     
-    # Save as list of dictionaries with "text" key
-    saved = [{"text": c} for c in chunks]
+    # Normalize the leaders data
+    chunks = normalize_leaders(sub)
     
-    with open(r"data\processed\official_wiki\leaders.json", "w", encoding="utf-8") as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+    # Stream as a list of dictionaries with "text" key
+    out_path = DATA_DIR / "processed" / "official_wiki" / "leaders.json"
+    write_chunks(chunks, out_path)
     
     print(f"Processed {len(chunks)} leader chunks")
-    print(f"Saved to: data\\processed\\official_wiki\\leaders.json")
+    print(f"Saved to: {out_path}")
 
 
 if __name__ == "__main__":
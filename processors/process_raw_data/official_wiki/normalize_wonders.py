@@ -1,323 +1,193 @@
-import json
-import re
+from .._data_io import DATA_DIR, load_json, write_chunks
+from .._pool import map_pages
+from ._chunk_utils import (
+    block,
+    extract_name as extract_wonder_name,
+    partition,
+    split_long_content,
+)
 
-def split_long_content(content_list, max_words=300):
-    """
-    Split long content blocks into smaller semantic chunks.
-    Tries to keep paragraphs together when possible.
-    """
-    chunks = []
-    current_chunk = []
-    current_word_count = 0
+
+def _normalize_one(data):
+    """Normalize a single wonder page into its list of chunks"""
+    out = []
     
-    for item in content_list:
-        word_count = len(item.split())
-        
-        # If adding this item would exceed max_words, save current chunk and start new
-        if current_word_count + word_count > max_words and current_chunk:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
-            current_word_count = 0
-        
-        current_chunk.append(item)
-        current_word_count += word_count
+    title = data.get("title", "")
+    source = data.get("source", "")
+    category = data.get("category", "")
+    url = data.get("url", "")
+    metadata = data.get("metadata", {})
     
-    # Add remaining content
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+    # Extract wonder name
+    wonder_name = extract_wonder_name(title)
     
-    return chunks
-
-
-def extract_wonder_name(title):
-    """Extract wonder name from title like 'Alhambra (Civ6)'"""
-    match = re.match(r'(.+?)\s*\(Civ6\)', title)
-    return match.group(1) if match else title
-
-
-def normalize_wonders(data_list):
-    """
-    Normalize wonder data from Civ6 wiki for RAG use.
+    # Determine if this is a system page or specific wonder page
+    is_system_page = wonder_name in ["Wonder", "Natural wonder", "List of wonders in Civ6", "Natural wonders"]
     
-    Creates multiple chunk types:
-    1. General system chunks - how wonders work (Wonder system, Natural wonder system)
-    2. Specific wonder chunks - individual wonder details
-    3. Strategy chunks - gameplay advice for wonders
+    # Per-document lines, shared by every section below
+    if not is_system_page:
+        title_line = f"Title: {wonder_name}"
+    elif "natural" in wonder_name.lower():
+        title_line = "Title: Natural Wonder System"
+    else:
+        title_line = "Title: Wonder System"
+    source_line = f"Source: {source}, {category}"
     
-    Extracts:
-    - Title: Wonder name or "Wonder System" / "Natural Wonder System"
-    - Section: Specific topic
-    - Key Facts: Short items, stats, requirements
-    - Main Content: Detailed explanations and strategy
-    - Source: Metadata string
-    """
-    out = []
-    
-    for data in data_list:
-        title = data.get("title", "")
-        source = data.get("source", "")
-        category = data.get("category", "")
-        url = data.get("url", "")
-        metadata = data.get("metadata", {})
-        
-        # Extract wonder name
-        wonder_name = extract_wonder_name(title)
+    for sec in data.get("sections", []):
+        heading = sec.get("heading", "")
+        content_list = sec.get("content", [])
         
-        # Determine if this is a system page or specific wonder page
-        is_system_page = wonder_name in ["Wonder", "Natural wonder", "List of wonders in Civ6", "Natural wonders"]
+        if not content_list:
+            continue
         
-        for sec in data.get("sections", []):
-            heading = sec.get("heading", "")
-            content_list = sec.get("content", [])
-            
-            if not content_list:
-                continue
-            
-            # === SYSTEM PAGES (General Information) ===
-            if is_system_page:
-                # Determine system type
-                if "natural" in wonder_name.lower():
-                    system_title = "Natural Wonder System"
-                else:
-                    system_title = "Wonder System"
-                
-                # Handle different section types
-                if heading in ["Introduction", "Finding natural wonders[]", "Bonuses and effects[]", 
-                              "Building a wonder[]", "Natural wonder picker[]"]:
-                    # General mechanics and rules
-                    total_words = sum(len(item.split()) for item in content_list)
-                    
-                    if total_words > 300:
-                        # Split long sections
-                        content_chunks = split_long_content(content_list, max_words=300)
-                        
-                        for i, chunk_content in enumerate(content_chunks):
-                            chunk = []
-                            chunk.append(f"Title: {system_title}")
-                            
-                            section_name = heading.replace('[]', '').strip()
-                            if len(content_chunks) > 1:
-                                chunk.append(f"Section: {section_name} (Part {i+1}/{len(content_chunks)})")
-                            else:
-                                chunk.append(f"Section: {section_name}")
-                            
-                            chunk.append("Main Content:")
-                            chunk.append(chunk_content)
-                            chunk.append(f"Source: {source}, {category}, game_mechanics")
-                            out.append("\n".join(chunk))
-                    else:
-                        facts = []
-                        main_content = []
-                        
-                        for item in content_list:
-                            if len(item) < 200:
-                                facts.append(item.strip())
-                            else:
-                                main_content.append(item.strip())
-                        
-                        chunk = []
-                        chunk.append(f"Title: {system_title}")
-                        chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                        
-                        if facts:
-                            chunk.append("Key Facts:")
-                            for f in facts:
-                                chunk.append(f"- {f}")
-                        
-                        if main_content:
-                            chunk.append("Main Content:")
-                            for m in main_content:
-                                chunk.append(m)
-                        
-                        chunk.append(f"Source: {source}, {category}, game_mechanics")
-                        out.append("\n".join(chunk))
+        # === SYSTEM PAGES (General Information) ===
+        if is_system_page:
+            # Handle different section types
+            if heading in ["Introduction", "Finding natural wonders[]", "Bonuses and effects[]", 
+                          "Building a wonder[]", "Natural wonder picker[]"]:
+                # General mechanics and rules
+                word_counts = [len(item.split()) for item in content_list]
+                total_words = sum(word_counts)
                 
-                elif heading == "Strategy[]":
-                    # Strategy for using wonders in general
-                    total_words = sum(len(item.split()) for item in content_list)
-                    
-                    if total_words > 300:
-                        content_chunks = split_long_content(content_list, max_words=300)
+                if total_words > 300:
+                    # Split long sections
+                    content_chunks = split_long_content(content_list, max_words=300, word_counts=word_counts)
+                    
+                    section_name = heading.replace('[]', '').strip()
+                    for i, chunk_content in enumerate(content_chunks):
+                        part_name = section_name
+                        if len(content_chunks) > 1:
+                            part_name = f"{section_name} (Part {i+1}/{len(content_chunks)})"
                         
-                        for i, chunk_content in enumerate(content_chunks):
-                            chunk = []
-                            chunk.append(f"Title: {system_title}")
-                            
-                            if len(content_chunks) > 1:
-                                chunk.append(f"Section: Strategy (Part {i+1}/{len(content_chunks)})")
-                            else:
-                                chunk.append("Section: Strategy")
-                            
-                            chunk.append("Main Content:")
-                            chunk.append(chunk_content)
-                            chunk.append(f"Source: {source}, {category}, strategy")
-                            out.append("\n".join(chunk))
-                    else:
-                        chunk = []
-                        chunk.append(f"Title: {system_title}")
-                        chunk.append("Section: Strategy")
-                        chunk.append("Main Content:")
-                        for item in content_list:
-                            chunk.append(item.strip())
-                        chunk.append(f"Source: {source}, {category}, strategy")
-                        out.append("\n".join(chunk))
-                
+                        out.append(f"{title_line}\nSection: {part_name}\nMain Content:\n{chunk_content}\n{source_line}, game_mechanics")
                 else:
-                    # Other system sections
-                    facts = []
-                    main_content = []
-                    
-                    for item in content_list:
-                        if len(item) < 200:
-                            facts.append(item.strip())
-                        else:
-                            main_content.append(item.strip())
+                    facts, main_content = partition(content_list)
                     
-                    chunk = []
-                    chunk.append(f"Title: {system_title}")
-                    chunk.append(f"Section: {heading.replace('[]', '').strip()}")
+                    facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+                    main_block = block("Main Content:", main_content) if main_content else ""
                     
-                    if facts:
-                        chunk.append("Key Facts:")
-                        for f in facts:
-                            chunk.append(f"- {f}")
-                    
-                    if main_content:
-                        chunk.append("Main Content:")
-                        for m in main_content:
-                            chunk.append(m)
+                    out.append(f"{title_line}\nSection: {heading.replace('[]', '').strip()}{facts_block}{main_block}\n{source_line}, game_mechanics")
+            
+            elif heading == "Strategy[]":
+                # Strategy for using wonders in general
+                word_counts = [len(item.split()) for item in content_list]
+                total_words = sum(word_counts)
+                
+                if total_words > 300:
+                    content_chunks = split_long_content(content_list, max_words=300, word_counts=word_counts)
                     
-                    chunk.append(f"Source: {source}, {category}")
-                    out.append("\n".join(chunk))
+                    for i, chunk_content in enumerate(content_chunks):
+                        part_name = "Strategy"
+                        if len(content_chunks) > 1:
+                            part_name = f"Strategy (Part {i+1}/{len(content_chunks)})"
+                        
+                        out.append(f"{title_line}\nSection: {part_name}\nMain Content:\n{chunk_content}\n{source_line}, strategy")
+                else:
+                    main_block = block("Main Content:", [item.strip() for item in content_list])
+                    out.append(f"{title_line}\nSection: Strategy{main_block}\n{source_line}, strategy")
             
-            # === SPECIFIC WONDER PAGES ===
             else:
-                # This is a specific wonder (like "Alhambra (Civ6)")
+                # Other system sections
+                facts, main_content = partition(content_list)
                 
-                if heading == "Introduction":
-                    # Create overview chunk with stats and basic info
-                    facts = []
-                    main_content = []
-                    
-                    # Add metadata as key facts
-                    if metadata:
-                        for key, value in metadata.items():
-                            if value:
-                                facts.append(f"{key}: {value}")
-                    
-                    # Process content
-                    for item in content_list:
-                        if len(item) < 200:
-                            facts.append(item.strip())
-                        else:
-                            main_content.append(item.strip())
-                    
-                    chunk = []
-                    chunk.append(f"Title: {wonder_name}")
-                    chunk.append("Section: Overview")
-                    
-                    if facts:
-                        chunk.append("Key Facts:")
-                        for f in facts:
-                            chunk.append(f"- {f}")
-                    
-                    if main_content:
-                        chunk.append("Main Content:")
-                        for m in main_content:
-                            chunk.append(m)
-                    
-                    chunk.append(f"Source: {source}, {category}")
-                    out.append("\n".join(chunk))
+                facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+                main_block = block("Main Content:", main_content) if main_content else ""
                 
-                elif heading == "Strategy[]":
-                    # Strategy for using this specific wonder
-                    chunk = []
-                    chunk.append(f"Title: {wonder_name}")
-                    chunk.append("Section: Strategy")
-                    chunk.append("Main Content:")
-                    for item in content_list:
-                        chunk.append(item.strip())
-                    chunk.append(f"Source: {source}, {category}, strategy")
-                    out.append("\n".join(chunk))
+                out.append(f"{title_line}\nSection: {heading.replace('[]', '').strip()}{facts_block}{main_block}\n{source_line}")
+        
+        # === SPECIFIC WONDER PAGES ===
+        else:
+            # This is a specific wonder (like "Alhambra (Civ6)")
+            
+            if heading == "Introduction":
+                # Create overview chunk with stats and basic info
+                facts, main_content = partition(content_list)
                 
-                elif heading == "Civilopedia entry[]":
-                    # Historical background
-                    total_words = sum(len(item.split()) for item in content_list)
-                    
-                    if total_words > 350:
-                        # Split long historical entries
-                        content_chunks = split_long_content(content_list, max_words=350)
-                        
-                        for i, chunk_content in enumerate(content_chunks):
-                            chunk = []
-                            chunk.append(f"Title: {wonder_name}")
-                            
-                            if len(content_chunks) > 1:
-                                chunk.append(f"Section: Historical Background (Part {i+1}/{len(content_chunks)})")
-                            else:
-                                chunk.append("Section: Historical Background")
-                            
-                            chunk.append("Main Content:")
-                            chunk.append(chunk_content)
-                            chunk.append(f"Source: {source}, {category}, history")
-                            out.append("\n".join(chunk))
-                    else:
-                        chunk = []
-                        chunk.append(f"Title: {wonder_name}")
-                        chunk.append("Section: Historical Background")
-                        chunk.append("Main Content:")
-                        for item in content_list:
-                            chunk.append(item.strip())
-                        chunk.append(f"Source: {source}, {category}, history")
-                        out.append("\n".join(chunk))
+                # Metadata goes first in the key facts
+                if metadata:
+                    facts = [f"{key}: {value}" for key, value in metadata.items() if value] + facts
+                
+                facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+                main_block = block("Main Content:", main_content) if main_content else ""
                 
+                out.append(f"{title_line}\nSection: Overview{facts_block}{main_block}\n{source_line}")
+            
+            elif heading == "Strategy[]":
+                # Strategy for using this specific wonder
+                main_block = block("Main Content:", [item.strip() for item in content_list])
+                out.append(f"{title_line}\nSection: Strategy{main_block}\n{source_line}, strategy")
+            
+            elif heading == "Civilopedia entry[]":
+                # Historical background
+                word_counts = [len(item.split()) for item in content_list]
+                total_words = sum(word_counts)
+                
+                if total_words > 350:
+                    # Split long historical entries
+                    content_chunks = split_long_content(content_list, max_words=350, word_counts=word_counts)
+                    
+                    for i, chunk_content in enumerate(content_chunks):
+                        part_name = "Historical Background"
+                        if len(content_chunks) > 1:
+                            part_name = f"Historical Background (Part {i+1}/{len(content_chunks)})"
+                        
+                        out.append(f"{title_line}\nSection: {part_name}\nMain Content:\n{chunk_content}\n{source_line}, history")
                 else:
-                    # Other sections (version-specific effects, etc.)
-                    facts = []
-                    main_content = []
-                    
-                    for item in content_list:
-                        if len(item) < 200:
-                            facts.append(item.strip())
-                        else:
-                            main_content.append(item.strip())
-                    
-                    chunk = []
-                    chunk.append(f"Title: {wonder_name}")
-                    chunk.append(f"Section: {heading.replace('[]', '').strip()}")
-                    
-                    if facts:
-                        chunk.append("Key Facts:")
-                        for f in facts:
-                            chunk.append(f"- {f}")
-                    
-                    if main_content:
-                        chunk.append("Main Content:")
-                        for m in main_content:
-                            chunk.append(m)
-                    
-                    chunk.append(f"Source: {source}, {category}")
-                    out.append("\n".join(chunk))
+                    main_block = block("Main Content:", [item.strip() for item in content_list])
+                    out.append(f"{title_line}\nSection: Historical Background{main_block}\n{source_line}, history")
+            
+            else:
+                # Other sections (version-specific effects, etc.)
+                facts, main_content = partition(content_list)
+                
+                facts_block = block("Key Facts:", ["- " + f for f in facts]) if facts else ""
+                main_block = block("Main Content:", main_content) if main_content else ""
+                
+                out.append(f"{title_line}\nSection: {heading.replace('[]', '').strip()}{facts_block}{main_block}\n{source_line}")
     
     return out
 
 
+def normalize_wonders(data_list, max_workers=1):
+    """
+    Normalize wonder data from Civ6 wiki for RAG use.
+    
+    Creates multiple chunk types:
+    1. General system chunks - how wonders work (Wonder system, Natural wonder system)
+    2. Specific wonder chunks - individual wonder details
+    3. Strategy chunks - gameplay advice for wonders
+    
+    Extracts:
+    - Title: Wonder name or "Wonder System" / "Natural Wonder System"
+    - Section: Specific topic
+    - Key Facts: Short items, stats, requirements
+    - Main Content: Detailed explanations and strategy
+    - Source: Metadata string
+    
+    Pages run in the current process unless max_workers asks for worker
+    processes (None = one per CPU); see map_pages.
+    Repeated chunks are kept only once.
+    """
+    return map_pages(_normalize_one, data_list, max_workers)
+
+
 def main():
     # Load the wonders data
-    with open(r"C:\Users\jeanb\Documents\misc-code\PingalAI\data\raw\civ6_wiki\civ6_complete_data.json", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(DATA_DIR / "raw" / "civ6_wiki" / "civ6_complete_data.json")
     
-    # Normalize the wonders data
-    chunks = normalize_wonders(data.get('wonders', {}))
+    # Keep only the subtree this script uses so the rest of the dump can be freed
+    sub = data.get('wonders', {})
+    del data
     
-    # Save as list of dictionaries with "text" key
-    saved = [{"text": c} for c in chunks]
+    # Normalize the wonders data
+    chunks = normalize_wonders(sub)
     
-    with open(r"data\processed\official_wiki\wonders.json", "w", encoding="utf-8") as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+    # Stream as a list of dictionaries with "text" key
+    out_path = DATA_DIR / "processed" / "official_wiki" / "wonders.json"
+    write_chunks(chunks, out_path)
     
     print(f"Processed {len(chunks)} wonder chunks")
-    print(f"Saved to: data\\processed\\official_wiki\\wonders.json")
+    print(f"Saved to: {out_path}")
 
 
 if __name__ == "__main__":
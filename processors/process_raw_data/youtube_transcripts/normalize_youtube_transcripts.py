@@ -1,5 +1,16 @@
-import json
 import re
+from collections import deque
+
+from .._data_io import DATA_DIR, load_json, write_chunks
+from .._pool import map_chunks
+
+# Repeated words, e.g. "the the the"
+_REPEAT_RE = re.compile(r'\b(\w+)( \1\b)+')
+_WS_RE = re.compile(r'\s+')
+
+# Sentence endings followed by space and a capital letter
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
 
 def clean_transcript(text):
     """
@@ -7,10 +18,10 @@ def clean_transcript(text):
     """
     # Remove repeated words (common in auto-generated transcripts)
     # e.g., "the the" -> "the"
-    text = re.sub(r'\b(\w+)( \1\b)+', r'\1', text)
+    text = _REPEAT_RE.sub(r'\1', text)
     
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WS_RE.sub(' ', text).strip()
     
     return text
 
@@ -38,7 +49,7 @@ def chunk_by_sentences(text, target_words=250, overlap_sentences=2):
     Chunk text by sentences with overlap for context continuity.
     
     Args:
-        text: The transcript text to chunk
+        text: The transcript text to chunk, as returned by clean_transcript
         target_words: Target number of words per chunk
         overlap_sentences: Number of sentences to overlap between chunks
     
@@ -47,7 +58,7 @@ def chunk_by_sentences(text, target_words=250, overlap_sentences=2):
     """
     # Split into sentences (improved regex for transcripts)
     # Looks for sentence endings followed by space and capital letter
-    sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', text)
+    sentences = _SENTENCE_RE.split(text)
     
     # Fallback if no proper sentences detected
     if len(sentences) == 1:
@@ -57,27 +68,44 @@ def chunk_by_sentences(text, target_words=250, overlap_sentences=2):
     current_chunk = []
     current_word_count = 0
     
+    # Last overlap_sentences (sentence, word count) pairs of the current
+    # chunk, with their running word total
+    tail = deque(maxlen=overlap_sentences)
+    tail_words = 0
+    
     for i, sentence in enumerate(sentences):
         sentence = sentence.strip()
         if not sentence:
             continue
             
-        sentence_words = len(sentence.split())
+        # Cleaned text has single spaces between words, so counting them
+        # gives the word count without splitting the sentence
+        sentence_words = sentence.count(' ') + 1
         
         # If adding this sentence would exceed target, save current chunk
         if current_word_count + sentence_words > target_words and current_chunk:
             chunks.append(' '.join(current_chunk))
             
-            # Add overlap: keep last N sentences for context
-            if len(current_chunk) >= overlap_sentences:
-                current_chunk = current_chunk[-overlap_sentences:]
-                current_word_count = sum(len(s.split()) for s in current_chunk)
+            # Add overlap: keep last N sentences for context; with no
+            # overlap the next chunk starts empty
+            if overlap_sentences and len(tail) == overlap_sentences:
+                current_chunk = [s for s, _ in tail]
+                current_word_count = tail_words
             else:
                 current_chunk = []
                 current_word_count = 0
+                tail.clear()
+                tail_words = 0
         
         current_chunk.append(sentence)
         current_word_count += sentence_words
+        
+        # Slide the overlap window; a full deque drops its oldest sentence
+        if overlap_sentences:
+            if len(tail) == overlap_sentences:
+                tail_words -= tail[0][1]
+            tail.append((sentence, sentence_words))
+            tail_words += sentence_words
     
     # Add remaining chunk
     if current_chunk:
@@ -86,7 +114,64 @@ def chunk_by_sentences(text, target_words=250, overlap_sentences=2):
     return chunks
 
 
-def normalize_youtube_transcripts(data_list):
+def _normalize_one(data):
+    """Normalize a single video's transcript into its list of chunks"""
+    out = []
+    
+    title = data.get("title", "")
+    url = data.get("url", "")
+    source = data.get("source", "")
+    category = data.get("category", "")
+    metadata = data.get("metadata", {})
+    
+    # Extract metadata
+    channel = metadata.get("channel", "")
+    video_id = metadata.get("video_id", "")
+    
+    # Source metadata, shared by every chunk of the video
+    source_meta = ", ".join(filter(None, (source, category, channel)))
+    
+    # Title and trailing Source/Video lines are the same for every chunk
+    title_line = f"Title: {title}"
+    tail = ""
+    if source_meta:
+        tail += f"\nSource: {source_meta}"
+    if url:
+        tail += f"\nVideo: {url}"
+    
+    for sec in data.get("sections", []):
+        heading = sec.get("heading", "")
+        content_list = sec.get("content", [])
+        
+        if not content_list:
+            continue
+        
+        # Combine all content into one transcript
+        full_transcript = ' '.join(content_list)
+        
+        # Clean up transcript
+        full_transcript = clean_transcript(full_transcript)
+        
+        # Skip if transcript is too short
+        if full_transcript.count(' ') + 1 < 50:
+            continue
+        
+        # Chunk with sentence awareness and overlap
+        text_chunks = chunk_by_sentences(
+            full_transcript, 
+            target_words=250, 
+            overlap_sentences=2
+        )
+        
+        # Create a chunk entry for each text chunk
+        total = len(text_chunks)
+        for i, chunk_text in enumerate(text_chunks):
+            out.append(f"{title_line}\nSection: Part {i+1}/{total}\nMain Content:\n{chunk_text}{tail}")
+    
+    return out
+
+
+def normalize_youtube_transcripts(data_list, max_workers=1):
     """
     Normalize YouTube transcript data for RAG use.
     
@@ -102,97 +187,30 @@ def normalize_youtube_transcripts(data_list):
     - Main Content: Chunk text
     - Source: youtube, category, channel
     - Video: URL
-    """
-    out = []
     
-    for data in data_list:
-        title = data.get("title", "")
-        url = data.get("url", "")
-        source = data.get("source", "")
-        category = data.get("category", "")
-        metadata = data.get("metadata", {})
-        
-        # Extract metadata
-        channel = metadata.get("channel", "")
-        video_id = metadata.get("video_id", "")
-        
-        for sec in data.get("sections", []):
-            heading = sec.get("heading", "")
-            content_list = sec.get("content", [])
-            
-            if not content_list:
-                continue
-            
-            # Combine all content into one transcript
-            full_transcript = ' '.join(content_list)
-            
-            # Clean up transcript
-            full_transcript = clean_transcript(full_transcript)
-            
-            # Skip if transcript is too short
-            if len(full_transcript.split()) < 50:
-                continue
-            
-            # Chunk with sentence awareness and overlap
-            text_chunks = chunk_by_sentences(
-                full_transcript, 
-                target_words=250, 
-                overlap_sentences=2
-            )
-            
-            # Create a chunk entry for each text chunk
-            for i, chunk_text in enumerate(text_chunks):
-                chunk = []
-                
-                # Title
-                chunk.append(f"Title: {title}")
-                
-                # Section with part number
-                chunk.append(f"Section: Part {i+1}/{len(text_chunks)}")
-                
-                # Main content
-                chunk.append("Main Content:")
-                chunk.append(chunk_text)
-                
-                # Build source metadata
-                meta_parts = []
-                if source:
-                    meta_parts.append(source)
-                if category:
-                    meta_parts.append(category)
-                if channel:
-                    meta_parts.append(channel)
-                
-                if meta_parts:
-                    chunk.append(f"Source: {', '.join(meta_parts)}")
-                
-                # Add video URL for reference
-                if url:
-                    chunk.append(f"Video: {url}")
-                
-                out.append("\n".join(chunk))
-    
-    return out
+    Videos run in the current process unless max_workers asks for worker
+    processes (None = one per CPU); see map_chunks. Repeated chunks are
+    kept, unlike in the wiki normalizers.
+    """
+    return map_chunks(_normalize_one, data_list, max_workers)
 
 
 def main():
     # Load the YouTube transcript data
-    with open(r"C:\Users\jeanb\Documents\misc-code\PingalAI\data\raw\youtube\youtube_transcripts.json", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(DATA_DIR / "raw" / "youtube" / "youtube_transcripts.json")
     
     # Normalize the YouTube transcripts
     video_data = data.get('youtube_strategy', [])
     
     chunks = normalize_youtube_transcripts(video_data)
     
-    # Save as list of dictionaries with "text" key
-    saved = [{"text": c} for c in chunks]
-    
-    with open(r"C:\Users\jeanb\Documents\misc-code\PingalAI\data\processed\youtube\transcripts.json", "w", encoding="utf-8") as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+    # Save as JSON Lines, one {"text": ...} record per line, so loaders can
+    # read the file record by record
+    out_path = DATA_DIR / "processed" / "youtube" / "transcripts.jsonl"
+    write_chunks(chunks, out_path)
     
     print(f"Processed {len(chunks)} transcript chunks")
-    print(f"Saved to: data\\processed\\youtube\\transcripts.json")
+    print(f"Saved to: {out_path}")
     
     # Print statistics
     if chunks:
@@ -0,0 +1,31 @@
+"""
+Tests for the shared BBG section normalizer
+"""
+
+import unittest
+
+from processors.process_raw_data.bgg_wki._common import normalize_sections
+
+
+class NormalizeSectionsTest(unittest.TestCase):
+
+    def test_sections_without_content_are_skipped(self):
+        page = {
+            "title": "Library",
+            "source": "bbg_wiki",
+            "category": "building",
+            "bbg_version": "6.5",
+            "sections": [
+                {"heading": "Stats", "content": []},
+                {"heading": "Notes"},
+                {"heading": "Effects", "content": ["+2 Science."]},
+                {"heading": "Misc", "content": None},
+            ],
+        }
+        self.assertEqual(normalize_sections(page), [
+            "Title: Library\nSection: Effects\nKey Facts:\n- +2 Science.\nSource: bbg_wiki, building, v6.5"
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Tests for the BBG run_all driver and its output cache
+"""
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from processors.process_raw_data.bgg_wki import normalize_buildings, run_all
+
+
+BUILDING = {
+    "title": "Buildings",
+    "source": "bbg_wiki",
+    "category": "building",
+    "sections": [{"heading": "Library", "content": ["+2 Science.", "Costs 90 production."]}],
+}
+
+
+class RunAllCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = Path(tmp.name)
+        (self.data_dir / "raw" / "bbg_wiki").mkdir(parents=True)
+        (self.data_dir / "processed" / "bbg").mkdir(parents=True)
+        self.out_path = self.data_dir / "processed" / "bbg" / "buildings.json"
+        self.cache_dir = self.data_dir / "processed" / ".cache" / "bbg"
+
+    def _run(self, building):
+        # Every other category is missing from the dump and gets skipped
+        raw_path = self.data_dir / "raw" / "bbg_wiki" / "bbg_complete_data.json"
+        raw_path.write_text(json.dumps({"building": [building]}), encoding="utf-8")
+        with mock.patch.object(run_all, "DATA_DIR", self.data_dir), contextlib.redirect_stdout(io.StringIO()):
+            run_all.main()
+
+    def _expected(self, building):
+        return [{"text": c} for c in run_all.normalize_sections(building)]
+
+    def test_miss_writes_output_and_cache(self):
+        self._run(BUILDING)
+        self.assertEqual(json.loads(self.out_path.read_text(encoding="utf-8")), self._expected(BUILDING))
+        cached = list(self.cache_dir.iterdir())
+        self.assertEqual(len(cached), 1)
+        self.assertEqual(cached[0].read_bytes(), self.out_path.read_bytes())
+        self.assertEqual([p.name for p in (self.data_dir / "processed" / "bbg").iterdir()], ["buildings.json"])
+
+    def test_hit_copies_from_cache(self):
+        self._run(BUILDING)
+        expected = self.out_path.read_bytes()
+        self.out_path.unlink()
+        with mock.patch.object(run_all, "normalize_sections") as normalize:
+            self._run(BUILDING)
+        normalize.assert_not_called()
+        self.assertEqual(self.out_path.read_bytes(), expected)
+
+    def test_changed_input_misses_cache(self):
+        self._run(BUILDING)
+        changed = dict(BUILDING, title="Buildings v2")
+        with mock.patch.object(run_all, "normalize_sections", wraps=run_all.normalize_sections) as normalize:
+            self._run(changed)
+        normalize.assert_called_once_with(changed)
+        self.assertEqual(json.loads(self.out_path.read_text(encoding="utf-8")), self._expected(changed))
+        # The entry for the old input is replaced, not kept next to the new one
+        cached = list(self.cache_dir.iterdir())
+        self.assertEqual(len(cached), 1)
+        self.assertEqual(cached[0].read_bytes(), self.out_path.read_bytes())
+
+    def test_other_categories_keep_their_cache(self):
+        self.cache_dir.mkdir(parents=True)
+        other = self.cache_dir / "natural_wonder-0123.json"
+        other.write_bytes(b"[]")
+        self._run(BUILDING)
+        self._run(dict(BUILDING, title="Buildings v2"))
+        self.assertTrue(other.exists())
+        self.assertEqual(len([p for p in self.cache_dir.iterdir() if p.name.startswith("building-")]), 1)
+
+    def test_matches_per_category_script(self):
+        self._run(BUILDING)
+        expected = self.out_path.read_bytes()
+        self.out_path.unlink()
+        with mock.patch.object(normalize_buildings, "DATA_DIR", self.data_dir), \
+                contextlib.redirect_stdout(io.StringIO()):
+            normalize_buildings.main()
+        self.assertEqual(self.out_path.read_bytes(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
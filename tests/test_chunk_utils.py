@@ -0,0 +1,69 @@
+"""
+Tests for the helpers shared by the official wiki normalizers
+"""
+
+import random
+import unittest
+
+from processors.process_raw_data.official_wiki import _chunk_utils
+
+
+def _greedy_split(content_list, max_words=300):
+    """Item-by-item splitter that split_long_content replaced"""
+    chunks = []
+    current_chunk = []
+    current_word_count = 0
+    for item in content_list:
+        word_count = len(item.split())
+        if current_word_count + word_count > max_words and current_chunk:
+            chunks.append(' '.join(current_chunk))
+            current_chunk = []
+            current_word_count = 0
+        current_chunk.append(item)
+        current_word_count += word_count
+    if current_chunk:
+        chunks.append(' '.join(current_chunk))
+    return chunks
+
+
+class SplitLongContentTest(unittest.TestCase):
+
+    def test_matches_greedy_splitter(self):
+        rng = random.Random(3)
+        for _ in range(5000):
+            items = [" ".join("w" * rng.randint(1, 3) for _ in range(rng.randint(0, 120)))
+                     for _ in range(rng.randint(1, 12))]
+            max_words = rng.randint(1, 400)
+            with self.subTest(items=items, max_words=max_words):
+                self.assertEqual(_chunk_utils.split_long_content(items, max_words), _greedy_split(items, max_words))
+
+    def test_word_counts_argument(self):
+        items = ["a b c", "d e", "f"]
+        self.assertEqual(_chunk_utils.split_long_content(items, 4, word_counts=[3, 2, 1]), ["a b c", "d e f"])
+
+
+class PartitionTest(unittest.TestCase):
+
+    def test_strips_items(self):
+        self.assertEqual(_chunk_utils.partition(["  fact  ", " " + "x" * 10], threshold=10), (["fact"], ["x" * 10]))
+
+    def test_strip_false_keeps_items(self):
+        # Already-stripped input is passed through as is
+        items = ["fact", "x" * 10]
+        facts, main_content = _chunk_utils.partition(items, threshold=10, strip=False)
+        self.assertEqual((facts, main_content), (["fact"], ["x" * 10]))
+        self.assertIs(facts[0], items[0])
+
+
+class ExtractNameTest(unittest.TestCase):
+
+    def test_titles(self):
+        self.assertEqual(_chunk_utils.extract_name("American (Civ6)"), "American")
+        self.assertEqual(_chunk_utils.extract_name("Natural wonder  (Civ6)"), "Natural wonder")
+        self.assertEqual(_chunk_utils.extract_name("List of wonders in Civ6"), "List of wonders in Civ6")
+        # The name needs at least one character
+        self.assertEqual(_chunk_utils.extract_name("(Civ6)"), "(Civ6)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Tests for the shared raw data loader and chunk writer
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from processors.process_raw_data._data_io import load_json, write_chunks
+
+
+CHUNKS = [
+    "Title: Alhambra\nSection: Overview\nMain Content:\nA palace.",
+    "Unicode: é ü 🎮 \"quoted\" \\ back\tslash",
+    "",
+]
+
+
+class WriteChunksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_array_matches_json_dump(self):
+        for chunks in (CHUNKS, CHUNKS[:1], []):
+            with self.subTest(count=len(chunks)):
+                path = os.path.join(self.tmp.name, "out.json")
+                self.assertEqual(write_chunks(iter(chunks), path), len(chunks))
+                expected = json.dumps([{"text": c} for c in chunks], indent=2, ensure_ascii=False)
+                with open(path, "rb") as f:
+                    self.assertEqual(f.read(), expected.encode("utf-8"))
+
+    def test_jsonl(self):
+        path = os.path.join(self.tmp.name, "out.jsonl")
+        self.assertEqual(write_chunks(CHUNKS, path), len(CHUNKS))
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{"text": c} for c in CHUNKS])
+
+
+class LoadJsonTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        data = {"wonders": [{"title": "Alhambra (Civ6)", "content": CHUNKS}], "empty": []}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            self.assertEqual(load_json(path), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
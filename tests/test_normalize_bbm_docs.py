@@ -0,0 +1,273 @@
+"""
+Tests for the BBM documentation normalizer
+"""
+
+import contextlib
+import io
+import json
+import random
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from processors.process_raw_data.bbm_docs import normalize_bbm_docs
+from processors.process_raw_data.bbm_docs.normalize_bbm_docs import (
+    _heading_level,
+    normalize_bbm_documentation,
+    parse_hierarchical_sections,
+    split_long_section,
+)
+
+
+def _baseline_parse(text):
+    """Original line-by-line parser, before the level and parent changes"""
+    sections = []
+    current_section = None
+    current_content = []
+    parent_stack = []
+
+    for line in text.split('\n'):
+        line_stripped = line.strip()
+        is_heading = False
+        heading_level = 1
+
+        if line_stripped and not line_stripped.endswith('.') and not line_stripped.endswith(','):
+            if line_stripped.isupper() or line_stripped.startswith('Step '):
+                is_heading = True
+                heading_level = 1
+            elif re.match(r'^Step \d+\.\d+', line_stripped):
+                is_heading = True
+                heading_level = 2
+            elif len(line_stripped) < 80 and not any(c in line_stripped for c in [',', '(', ')']):
+                words = line_stripped.split()
+                if len(words) <= 8 and line_stripped[0].isupper():
+                    is_heading = True
+                    heading_level = 2
+
+        if is_heading and current_section:
+            if current_content:
+                sections.append({
+                    'title': current_section,
+                    'level': heading_level,
+                    'content': '\n'.join(current_content).strip(),
+                    'parent': parent_stack[-1] if parent_stack else None
+                })
+            current_section = line_stripped
+            current_content = []
+            if heading_level == 1:
+                parent_stack = [line_stripped]
+            elif heading_level == 2:
+                parent_stack = [parent_stack[0], line_stripped] if len(parent_stack) > 0 else [line_stripped]
+        elif is_heading and not current_section:
+            current_section = line_stripped
+            parent_stack = [line_stripped]
+        elif line_stripped:
+            current_content.append(line_stripped)
+
+    if current_section and current_content:
+        sections.append({
+            'title': current_section,
+            'level': heading_level,
+            'content': '\n'.join(current_content).strip(),
+            'parent': parent_stack[-1] if parent_stack and len(parent_stack) > 1 else None
+        })
+
+    return sections
+
+
+def _baseline_heading_level(line):
+    """Heading check of the original loop, with "Step X.Y" moved first (None = not a heading)"""
+    line_stripped = line.strip()
+    if line_stripped and not line_stripped.endswith('.') and not line_stripped.endswith(','):
+        # "Step X.Y" lines are level 2; the old loop checked them too late
+        if re.match(r'^Step \d+\.\d+', line_stripped):
+            return 2
+        if line_stripped.isupper() or line_stripped.startswith('Step '):
+            return 1
+        if len(line_stripped) < 80 and not any(c in line_stripped for c in [',', '(', ')']):
+            words = line_stripped.split()
+            if len(words) <= 8 and line_stripped[0].isupper():
+                return 2
+    return None
+
+
+def _line_heading_level(line):
+    line_stripped = line.strip()
+    return _heading_level(line_stripped) if line_stripped else None
+
+
+def _random_line(rng, tokens):
+    line = ''.join(rng.choice(tokens) + rng.choice(['', ' ', '\t']) for _ in range(rng.randint(0, 14)))
+    if rng.random() < 0.3:
+        line = 'Step ' + line
+    return line
+
+
+TOKENS = ['Step', 'STEP', '1.2', '3', 'A', 'abc', 'Hello', 'X,', '(y)', '.', ',', ' ', '\t', '\r', 'ok.', 'Z',
+          'É', 'été', 'ÉTAPE', 'ß', '\x0c']
+
+
+class HeadingDetectionTest(unittest.TestCase):
+
+    def test_trailing_punctuation_before_whitespace(self):
+        for line in ['HELLO. ', 'Step 1.2 Foo. ', 'Step 3 go. ', 'HELLO, ', '\tSTEP ONE.\t', 'Short title. ']:
+            with self.subTest(line=line):
+                self.assertIsNone(_line_heading_level(line))
+
+    def test_trailing_whitespace_after_heading(self):
+        self.assertEqual(_line_heading_level('Step 1.2 Foo  '), 2)
+        self.assertEqual(_line_heading_level('HELLO \t'), 1)
+        self.assertEqual(_line_heading_level('Short Title '), 2)
+
+    def test_unicode_case(self):
+        self.assertEqual(_line_heading_level('ÉTAPE UN'), 1)
+        self.assertEqual(_line_heading_level('Élan vital'), 2)
+        self.assertIsNone(_line_heading_level('été indien'))
+
+    def test_matches_baseline_classifier(self):
+        rng = random.Random(7)
+        for _ in range(20000):
+            line = _random_line(rng, TOKENS)
+            with self.subTest(line=line):
+                self.assertEqual(_line_heading_level(line), _baseline_heading_level(line))
+
+
+class ParseHierarchicalSectionsTest(unittest.TestCase):
+
+    def test_golden(self):
+        text = (
+            "intro line before headings.\n"
+            "STEP 1 OVERVIEW\n"
+            "First paragraph of step one.\n"
+            "Step 1.2 Placement  \n"
+            "Place the city on a river.   \n"
+            "Step 2 Map\n"
+            "Map notes,\n"
+            "Step 3 go. \n"
+            "This sentence continues step two.\n"
+            "Short Title\n"
+            "Closing words.\n"
+        )
+        self.assertEqual(parse_hierarchical_sections(text), [
+            {
+                'title': 'STEP 1 OVERVIEW',
+                'level': 1,
+                'content': 'intro line before headings.\nFirst paragraph of step one.',
+                'parent': None,
+            },
+            {
+                'title': 'Step 1.2 Placement',
+                'level': 2,
+                'content': 'Place the city on a river.',
+                'parent': 'STEP 1 OVERVIEW',
+            },
+            {
+                'title': 'Step 2 Map',
+                'level': 1,
+                'content': 'Map notes,\nStep 3 go.\nThis sentence continues step two.',
+                'parent': None,
+            },
+            {
+                'title': 'Short Title',
+                'level': 2,
+                'content': 'Closing words.',
+                'parent': 'Step 2 Map',
+            },
+        ])
+
+    def test_same_sections_as_baseline_parser(self):
+        # Only levels and parents differ from the old loop
+        rng = random.Random(11)
+        for _ in range(5000):
+            text = '\n'.join(_random_line(rng, TOKENS) for _ in range(rng.randint(0, 20)))
+            with self.subTest(text=text):
+                self.assertEqual(
+                    [(sec['title'], sec['content']) for sec in parse_hierarchical_sections(text)],
+                    [(sec['title'], sec['content']) for sec in _baseline_parse(text)],
+                )
+
+    def test_no_headings(self):
+        self.assertEqual(parse_hierarchical_sections("just a sentence.\nanother one."), [])
+
+
+class SplitLongSectionTest(unittest.TestCase):
+
+    def test_tab_separated_words(self):
+        paragraphs = ['\t'.join(['word'] * 100) for _ in range(6)]
+        self.assertEqual(split_long_section('\n'.join(paragraphs), max_words=400), [
+            '\n'.join(paragraphs[:4]),
+            '\n'.join(paragraphs[4:]),
+        ])
+
+    def test_runs_of_whitespace(self):
+        paragraphs = ['  '.join(['word'] * 150), ' \t '.join(['word'] * 150), 'word']
+        self.assertEqual(split_long_section('\n'.join(paragraphs), max_words=300), [
+            '\n'.join(paragraphs[:2]),
+            'word',
+        ])
+
+
+class NormalizeBbmDocumentationTest(unittest.TestCase):
+
+    def test_toc_and_parent_sections(self):
+        doc = {
+            "title": "BBM",
+            "sections": [{"content": [
+                "OVERVIEW\nWhat the mod does.\n"
+                "Step 1.1 Land\nMore land.\n"
+                "Step 1.2 Water\nMore water.\n"
+                "Step 2 Resources\nResource notes."
+            ]}],
+        }
+        toc, *chunks = normalize_bbm_documentation([doc])
+        self.assertEqual(toc, (
+            "Title: BBM\n"
+            "Section: Table of Contents\n"
+            "Main Content:\n"
+            "This document covers the following topics:\n"
+            "\n• OVERVIEW\n"
+            "  - Step 1.1 Land\n"
+            "  - Step 1.2 Water\n"
+            "\n• Step 2 Resources\n"
+            "\nSource: bbm_docs, game_mods, documentation"
+        ))
+        self.assertEqual(chunks, [
+            "Title: BBM\nSection: OVERVIEW\nMain Content:\nWhat the mod does.\n"
+            "Source: bbm_docs, game_mods, documentation",
+            "Title: BBM\nSection: Step 1.1 Land\nParent Section: OVERVIEW\nMain Content:\nMore land.\n"
+            "Source: bbm_docs, game_mods, documentation",
+            "Title: BBM\nSection: Step 1.2 Water\nParent Section: OVERVIEW\nMain Content:\nMore water.\n"
+            "Source: bbm_docs, game_mods, documentation",
+            "Title: BBM\nSection: Step 2 Resources\nMain Content:\nResource notes.\n"
+            "Source: bbm_docs, game_mods, documentation",
+        ])
+
+
+class MainOutputTest(unittest.TestCase):
+
+    def test_main_reads_and_writes_under_data_dir(self):
+        text = "OVERVIEW\nWhat the mod does é.\nStep 1.1 Land\nMore land."
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            (data_dir / "raw" / "bbm").mkdir(parents=True)
+            (data_dir / "processed" / "bbm").mkdir(parents=True)
+            (data_dir / "raw" / "bbm" / "BBM v1.1.txt").write_bytes(text.encode("utf-8"))
+
+            with mock.patch.object(normalize_bbm_docs, "DATA_DIR", data_dir), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                normalize_bbm_docs.main()
+
+            out_path = data_dir / "processed" / "bbm" / "documentation.json"
+            saved = json.loads(out_path.read_text(encoding="utf-8"))
+
+        expected = normalize_bbm_documentation([{
+            "title": "BBM - Better Balanced Maps v1.1",
+            "sections": [{"content": [text]}],
+        }])
+        self.assertEqual(saved, [{"text": c} for c in expected])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Tests for the official wiki building normalizer
+"""
+
+import unittest
+
+from processors.process_raw_data.official_wiki.normalize_buildings import normalize_buildings
+
+
+class RegionalEffectsTest(unittest.TestCase):
+
+    def test_only_exact_district_headers_start_a_district(self):
+        page = {
+            "title": "Building (Civ6)",
+            "source": "civ6_wiki",
+            "category": "buildings",
+            "sections": [{"heading": "Buildings with regional effects[]", "content": [
+                "Some buildings affect nearby cities.",
+                # Mentions a district but is not one of the headers
+                "Holy Site buildings[]",
+                " Industrial Zone[] ",
+                "Factory: +3 Production to cities within 6 tiles.",
+                "Water Park[]",
+                "Ferris Wheel: +1 Amenity.",
+            ]}],
+        }
+        self.assertEqual(normalize_buildings([page], max_workers=1), [
+            "Title: Building System\nSection: Regional Effects Overview\nMain Content:\n"
+            "Some buildings affect nearby cities.\nHoly Site buildings[]\n"
+            "Source: civ6_wiki, buildings, regional_effects",
+            "Title: Building System\nSection: Regional Effects - Industrial Zone\nKey Facts:\n"
+            "- Factory: +3 Production to cities within 6 tiles.\n"
+            "Source: civ6_wiki, buildings, regional_effects",
+            "Title: Building System\nSection: Regional Effects - Water Park\nKey Facts:\n"
+            "- Ferris Wheel: +1 Amenity.\n"
+            "Source: civ6_wiki, buildings, regional_effects",
+        ])
+
+
+class SourceLineTest(unittest.TestCase):
+
+    def test_empty_fields_are_left_out(self):
+        pages = [
+            {"title": "Library (Civ6)", "category": "buildings",
+             "sections": [{"heading": "Effects[]", "content": ["+2 Science."]}]},
+            {"title": "Building (Civ6)", "source": "civ6_wiki",
+             "sections": [{"heading": "Effects[]", "content": ["Buildings go in districts."]}]},
+        ]
+        self.assertEqual(normalize_buildings(pages, max_workers=1), [
+            "Title: Library\nSection: Effects\nKey Facts:\n- +2 Science.\nSource: buildings",
+            "Title: Building System\nSection: Effects\nKey Facts:\n- Buildings go in districts.\n"
+            "Source: civ6_wiki, game_mechanics",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
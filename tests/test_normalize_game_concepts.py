@@ -0,0 +1,35 @@
+"""
+Tests for the official wiki game concept normalizer
+"""
+
+import unittest
+
+from processors.process_raw_data.official_wiki.normalize_game_concepts import normalize_game_concepts
+
+
+class ContentItemsTest(unittest.TestCase):
+
+    def test_items_are_stripped_and_blank_ones_dropped(self):
+        page = {
+            "title": "Loyalty (Civ6)",
+            "source": "civ6_wiki",
+            "category": "game_concepts",
+            "sections": [
+                {"heading": "Introduction", "content": ["  Cities have loyalty.  ", "", "   ",
+                                                        "\tLoyalty drops near foreign cities.\n"]},
+                # Only blank items, so no chunk at all
+                {"heading": "Notes[]", "content": ["  ", "\n"]},
+            ],
+        }
+        self.assertEqual(normalize_game_concepts([page], max_workers=1), [
+            "Title: Loyalty\n"
+            "Section: Overview\n"
+            "Key Facts:\n"
+            "- Cities have loyalty.\n"
+            "- Loyalty drops near foreign cities.\n"
+            "Source: civ6_wiki, game_concepts, game_mechanics"
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
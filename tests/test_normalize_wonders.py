@@ -0,0 +1,63 @@
+"""
+Golden tests for the official wiki wonders normalizer
+"""
+
+import unittest
+
+from processors.process_raw_data.official_wiki.normalize_wonders import normalize_wonders
+
+
+PAGES = [
+    {
+        "title": "Alhambra (Civ6)",
+        "source": "civ6_wiki",
+        "category": "wonders",
+        "metadata": {"Era": "Medieval", "Cost": ""},
+        "sections": [
+            {"heading": "Introduction", "content": ["Grants a Governor title.", "The Alhambra " + "is a palace " * 70]},
+            {"heading": "Strategy[]", "content": ["  Build it early.  "]},
+            {"heading": "Civilopedia entry[]", "content": ["word " * 200, "more " * 200]},
+            {"heading": "Trivia[]", "content": []},
+        ],
+    },
+    {
+        "title": "Natural wonder (Civ6)",
+        "source": "civ6_wiki",
+        "category": "wonders",
+        "metadata": None,
+        "sections": [{"heading": "Strategy[]", "content": ["Settle next to them."]}],
+    },
+    # Repeats the first page's strategy chunk, which is kept only once
+    {
+        "title": "Alhambra (Civ6)",
+        "source": "civ6_wiki",
+        "category": "wonders",
+        "metadata": {},
+        "sections": [{"heading": "Strategy[]", "content": ["  Build it early.  "]}],
+    },
+]
+
+EXPECTED = [
+    "Title: Alhambra\nSection: Overview\nKey Facts:\n- Era: Medieval\n- Grants a Governor title.\n"
+    "Main Content:\nThe Alhambra " + ("is a palace " * 70).strip() + "\nSource: civ6_wiki, wonders",
+    "Title: Alhambra\nSection: Strategy\nMain Content:\nBuild it early.\nSource: civ6_wiki, wonders, strategy",
+    "Title: Alhambra\nSection: Historical Background (Part 1/2)\nMain Content:\n" + "word " * 200
+    + "\nSource: civ6_wiki, wonders, history",
+    "Title: Alhambra\nSection: Historical Background (Part 2/2)\nMain Content:\n" + "more " * 200
+    + "\nSource: civ6_wiki, wonders, history",
+    "Title: Natural Wonder System\nSection: Strategy\nMain Content:\nSettle next to them.\n"
+    "Source: civ6_wiki, wonders, strategy",
+]
+
+
+class NormalizeWondersTest(unittest.TestCase):
+
+    def test_golden(self):
+        self.assertEqual(normalize_wonders(PAGES, max_workers=1), EXPECTED)
+
+    def test_worker_pool_matches_serial(self):
+        self.assertEqual(normalize_wonders(PAGES * 3, max_workers=2), EXPECTED)
+
+
+if __name__ == "__main__":
+    unittest.main()
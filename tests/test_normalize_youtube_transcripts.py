@@ -0,0 +1,74 @@
+"""
+Tests for the YouTube transcript normalizer
+"""
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from processors.process_raw_data.youtube_transcripts import normalize_youtube_transcripts as yt
+
+
+def _video(title, sentences):
+    text = " ".join(f"Sentence {i} about the {title} opening é." for i in range(sentences))
+    return {
+        "title": title,
+        "url": f"https://youtu.be/{title}",
+        "source": "youtube",
+        "category": "strategy",
+        "metadata": {"channel": "chan", "video_id": title},
+        "sections": [{"heading": "Transcript", "content": [text]}],
+    }
+
+
+VIDEOS = [_video("rome", 120), _video("korea", 40), _video("short", 2)]
+
+
+class MainOutputTest(unittest.TestCase):
+
+    def test_main_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            (data_dir / "raw" / "youtube").mkdir(parents=True)
+            (data_dir / "processed" / "youtube").mkdir(parents=True)
+            (data_dir / "raw" / "youtube" / "youtube_transcripts.json").write_text(
+                json.dumps({"youtube_strategy": VIDEOS}), encoding="utf-8")
+
+            with mock.patch.object(yt, "DATA_DIR", data_dir), contextlib.redirect_stdout(io.StringIO()):
+                yt.main()
+
+            out_path = data_dir / "processed" / "youtube" / "transcripts.jsonl"
+            with open(out_path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+        expected = yt.normalize_youtube_transcripts(VIDEOS, max_workers=1)
+        self.assertTrue(expected)
+        # One compact {"text": ...} record per line, in order
+        self.assertEqual([json.loads(line) for line in lines], [{"text": c} for c in expected])
+        self.assertFalse(any(line.startswith(" ") for line in lines))
+
+
+class ChunkBySentencesTest(unittest.TestCase):
+
+    TEXT = "One two three. Four five six. Seven eight nine. Ten eleven twelve."
+
+    def test_no_overlap(self):
+        self.assertEqual(yt.chunk_by_sentences(self.TEXT, target_words=6, overlap_sentences=0), [
+            "One two three. Four five six.",
+            "Seven eight nine. Ten eleven twelve.",
+        ])
+
+    def test_overlap_keeps_last_sentences(self):
+        self.assertEqual(yt.chunk_by_sentences(self.TEXT, target_words=6, overlap_sentences=1), [
+            "One two three. Four five six.",
+            "Four five six. Seven eight nine.",
+            "Seven eight nine. Ten eleven twelve.",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Tests for the worker pool shared by the normalizers
+"""
+
+import unittest
+
+from processors.process_raw_data import _pool
+
+
+class MapChunksTest(unittest.TestCase):
+
+    def test_keeps_repeats_in_order(self):
+        pages = [["a", "b"], ["b"], ["a"]]
+        self.assertEqual(_pool.map_chunks(list, pages), ["a", "b", "b", "a"])
+        self.assertEqual(_pool.map_chunks(list, pages * 10, max_workers=2), ["a", "b", "b", "a"] * 10)
+
+
+class MapPagesTest(unittest.TestCase):
+
+    def test_dedupes_in_order(self):
+        pages = [["a", "b"], ["b", "c"], ["a"]]
+        self.assertEqual(_pool.map_pages(list, pages, max_workers=1), ["a", "b", "c"])
+
+    def test_runs_in_process_by_default(self):
+        # A lambda can't be pickled, so this only works without a pool
+        self.assertEqual(_pool.map_pages(lambda page: page, [["a"], ["b"]]), ["a", "b"])
+
+    def test_worker_pool_dedupes_in_order(self):
+        pages = [["a", "b"], ["b", "c"], ["a"]] * 10
+        self.assertEqual(_pool.map_pages(list, pages, max_workers=2), ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()